@@ -21,12 +21,37 @@ from typing import List
 from warnings import warn
 
 import numpy as np
-import pandas as pd
 from numpy import ndarray
 
 from daplis.functions import utils
 
 
+def _pair_deltas(
+    timestamps_1: ndarray, timestamps_2: ndarray, delta_window: float
+) -> ndarray:
+    """Collect differences between all timestamps of two pixels.
+
+    Parameters
+    ----------
+    timestamps_1 : ndarray
+        Timestamps of the first pixel in the pair.
+    timestamps_2 : ndarray
+        Timestamps of the second pixel in the pair.
+    delta_window : float
+        Width of the time window for counting timestamp differences.
+
+    Returns
+    -------
+    ndarray
+        Differences of each timestamp of the second pixel and each
+        timestamp of the first pixel in the given window, ordered by
+        the timestamps of the first pixel.
+    """
+    deltas = timestamps_2[np.newaxis, :] - timestamps_1[:, np.newaxis]
+
+    return deltas[np.abs(deltas) < delta_window]
+
+
 # TODO remove - deprecated
 def calculate_differences_2212(
     data: List[float],
@@ -73,32 +98,40 @@ def calculate_differences_2212(
 
     pixels_left, pixels_right = utils.pixel_list_transform(pixels)
 
+    # TDC number and pixel position in that TDC for each pixel
+    tdc_of_pixel, col_of_pixel = utils.invert_pixel_coordinates(pix_coor)
+
     # Find ends of cycles
-    cycle_ends = np.argwhere(data[0].T[0] == -2)
+    cycle_ends = np.flatnonzero(data[0].T[0] == -2)
     cycle_ends = np.insert(cycle_ends, 0, 0)
 
     for q in pixels_left:
+        # Only pixels with larger numbers are paired with the first one
+        pixels_paired = [w for w in pixels_right if w > q]
+        if not pixels_paired:
+            continue
+
         # First pixel in the pair
-        tdc1, pix_c1 = np.argwhere(pix_coor == q)[0]
+        tdc1, pix_c1 = tdc_of_pixel[q], col_of_pixel[q]
         pix1 = np.where(data[tdc1].T[0] == pix_c1)[0]
-        for w in pixels_right:
-            if w <= q:
-                continue
+        # Positions of the pixel data are sorted, so the range of each
+        # cycle is found for all cycles at once
+        cycle_bounds1 = np.searchsorted(pix1, cycle_ends)
+        for w in pixels_paired:
             deltas_all[f"{q},{w}"] = []
 
             # Second pixel in the pair
-            tdc2, pix_c2 = np.argwhere(pix_coor == w)[0]
+            tdc2, pix_c2 = tdc_of_pixel[w], col_of_pixel[w]
             pix2 = np.where(data[tdc2].T[0] == pix_c2)[0]
+            cycle_bounds2 = np.searchsorted(pix2, cycle_ends)
 
             # Go over cycles, getting data for the appropriate cycle
             # only
             for cyc in range(len(cycle_ends) - 1):
-                slice_from = cycle_ends[cyc]
-                slice_to = cycle_ends[cyc + 1]
-                pix1_slice = pix1[(pix1 >= slice_from) & (pix1 < slice_to)]
+                pix1_slice = pix1[cycle_bounds1[cyc] : cycle_bounds1[cyc + 1]]
                 if not np.any(pix1_slice):
                     continue
-                pix2_slice = pix2[(pix2 >= slice_from) & (pix2 < slice_to)]
+                pix2_slice = pix2[cycle_bounds2[cyc] : cycle_bounds2[cyc + 1]]
                 if not np.any(pix2_slice):
                     continue
 
@@ -107,14 +140,95 @@ def calculate_differences_2212(
                 tmsp1 = tmsp1[tmsp1 > 0]
                 tmsp2 = data[tdc2].T[1][pix2_slice]
                 tmsp2 = tmsp2[tmsp2 > 0]
-                for t1 in tmsp1:
-                    deltas = tmsp2 - t1
-                    ind = np.where(np.abs(deltas) < delta_window)[0]
-                    deltas_all[f"{q},{w}"].extend(deltas[ind])
+                deltas_all[f"{q},{w}"].extend(
+                    _pair_deltas(tmsp1, tmsp2, delta_window)
+                )
 
     return deltas_all
 
 
+def _neighbour_differences(
+    timestamps_1: ndarray, timestamps_2: ndarray, delta_window: float
+) -> ndarray:
+    """Collect differences between neighbouring timestamps of two pixels.
+
+    Timestamps of both pixels are merged and sorted; differences are
+    taken only between neighbours that come from different pixels.
+
+    Parameters
+    ----------
+    timestamps_1 : ndarray
+        Timestamps of the first pixel in the pair.
+    timestamps_2 : ndarray
+        Timestamps of the second pixel in the pair.
+    delta_window : float
+        Width of the time window for counting timestamp differences.
+
+    Returns
+    -------
+    ndarray
+        Timestamp differences in the given window, positive where the
+        timestamp of the second pixel comes later.
+    """
+    timestamps = np.concatenate((timestamps_1, timestamps_2))
+
+    # Indicators for each pixel: 0 for timestamps from one pixel
+    # 1 - from the other
+    pixel_index = np.concatenate(
+        (
+            np.zeros(len(timestamps_1), dtype=np.float64),
+            np.ones(len(timestamps_2), dtype=np.float64),
+        )
+    )
+
+    # Sort the timestamps, carrying the pixel indicators along
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    pixel_index = pixel_index[order]
+
+    # Subtract pixel indicators of neighbors; values of 0 correspond to
+    # timestamp differences for the same pixel, '-1' and '1' - to
+    # differences from different pixels, which also give the sign
+    pixel_index_diff = np.diff(pixel_index)
+    timestamp_diff = np.diff(timestamps) * pixel_index_diff
+
+    # Save only timestamps differences from different pixels in the
+    # requested window
+    return timestamp_diff[
+        (pixel_index_diff != 0) & (np.abs(timestamp_diff) < delta_window)
+    ]
+
+
+def _pixel_pairs(pixels_left: List[int], pixels_right: List[int]) -> ndarray:
+    """Build the array of pixel pairs for calculating differences.
+
+    Only pixels with larger numbers are paired with the first one.
+
+    Parameters
+    ----------
+    pixels_left : List[int]
+        First pixels of the pairs.
+    pixels_right : List[int]
+        Second pixels of the pairs.
+
+    Returns
+    -------
+    ndarray
+        Array of shape (number of pairs, 2) of pixel numbers, ordered
+        by the first and then the second pixel as given.
+    """
+    pairs = np.stack(
+        np.meshgrid(
+            np.asarray(pixels_left, dtype=np.int32),
+            np.asarray(pixels_right, dtype=np.int32),
+            indexing="ij",
+        ),
+        axis=-1,
+    ).reshape(-1, 2)
+
+    return pairs[pairs[:, 1] > pairs[:, 0]]
+
+
 def calculate_differences_2212_fast(
     data: ndarray,
     pixels: List[int] | List[List[int]],
@@ -156,102 +270,64 @@ def calculate_differences_2212_fast(
     deltas_all = {}
 
     pixels_left, pixels_right = utils.pixel_list_transform(pixels)
+    pairs = _pixel_pairs(pixels_left, pixels_right)
+    pixels_in_pairs = np.unique(pairs)
+
+    # TDC number and pixel position in that TDC for each pixel
+    tdc_of_pixel, col_of_pixel = utils.invert_pixel_coordinates(pix_coor)
 
     # Find ends of cycles
-    cycle_ends = np.argwhere(data[0].T[0] == -2)
+    cycle_ends = np.flatnonzero(data[0].T[0] == -2)
     cycle_ends = np.insert(cycle_ends, 0, 0)
 
-    for q in pixels_left:
-        # First pixel in the pair
-        tdc1, pix_c1 = np.argwhere(pix_coor == q)[0]
-        pix1 = np.where(data[tdc1].T[0] == pix_c1)[0]
-        for w in pixels_right:
-            if w <= q:
-                continue
-            deltas_all[f"{q},{w}"] = []
-
-            timestamps_1 = []
-            timestamps_2 = []
-
-            # Second pixel in the pair
-            tdc2, pix_c2 = np.argwhere(pix_coor == w)[0]
-            pix2 = np.where(data[tdc2].T[0] == pix_c2)[0]
-
-            # Go over cycles, shifting the timestamps from each next
-            # cycle by lengths of cycles before (e.g., for the 4th cycle
-            # add 12 ms)
-            for i, _ in enumerate(cycle_ends[:-1]):
-                slice_from = cycle_ends[i]
-                slice_to = cycle_ends[i + 1]
-                pix1_slice = pix1[(pix1 >= slice_from) & (pix1 < slice_to)]
-                if not np.any(pix1_slice):
-                    continue
-                pix2_slice = pix2[(pix2 >= slice_from) & (pix2 < slice_to)]
-                if not np.any(pix2_slice):
-                    continue
-
-                # Shift timestamps by cycle length
-                tmsp1 = data[tdc1].T[1][pix1_slice]
-                tmsp1 = tmsp1[tmsp1 > 0]
-                tmsp1 = tmsp1 + cycle_length * i
-
-                tmsp2 = data[tdc2].T[1][pix2_slice]
-                tmsp2 = tmsp2[tmsp2 > 0]
-                tmsp2 = tmsp2 + cycle_length * i
-
-                timestamps_1.extend(tmsp1)
-                timestamps_2.extend(tmsp2)
-
-            timestamps_1 = np.array(timestamps_1)
-            timestamps_2 = np.array(timestamps_2)
-
-            # Indicators for each pixel: 0 for timestamps from one pixel
-            # 1 - from the other
-            pix1_ind = np.zeros(len(timestamps_1), dtype=np.int32)
-            pix2_ind = np.ones(len(timestamps_2), dtype=np.int32)
-
-            pix1_data = np.vstack((pix1_ind, timestamps_1))
-            pix2_data = np.vstack((pix2_ind, timestamps_2))
-
-            # Dataframe for each pixel with pixel indicator and
-            # timestamps
-            df1 = pd.DataFrame(
-                pix1_data.T, columns=["Pixel_index", "Timestamp"]
-            )
-            df2 = pd.DataFrame(
-                pix2_data.T, columns=["Pixel_index", "Timestamp"]
-            )
-
-            # Combine the two dataframes
-            df_combined = pd.concat((df1, df2), ignore_index=True)
-
-            # Sort the timestamps
-            df_combined.sort_values("Timestamp", inplace=True)
-
-            # Subtract pixel indicators of neighbors; values of 0
-            # correspond to timestamp differences for the same pixel
-            # '-1' and '1' - to differences from different pixels
-            df_combined["Pixel_index_diff"] = df_combined["Pixel_index"].diff()
-
-            # Calculate timestamp difference between neighbors
-            df_combined["Timestamp_diff"] = df_combined["Timestamp"].diff()
-
-            # Get the correct timestamp difference sign
-            df_combined["Timestamp_diff"] = (
-                df_combined["Timestamp_diff"] * df_combined["Pixel_index_diff"]
-            )
-
-            # Collect timestamp differences where timestamps are from
-            # different pixels
-            filtered_df = df_combined[
-                abs(df_combined["Pixel_index_diff"]) == 1
-            ]
-
-            # Save only timestamps differences in the requested window
-            delta_ts = filtered_df[
-                abs(filtered_df["Timestamp_diff"]) < delta_window
-            ]["Timestamp_diff"].values
-
-            deltas_all[f"{q},{w}"].extend(delta_ts)
+    number_of_cycles = len(cycle_ends) - 1
+
+    # Contiguous int8 copies of the pixel addresses for the TDCs of the
+    # paired pixels; searching for each pixel below then scans only
+    # these instead of every other value of the timestamp matrix
+    pixel_addresses = {
+        tdc: data[tdc].T[0].astype(np.int8)
+        for tdc in np.unique(tdc_of_pixel[pixels_in_pairs])
+    }
+
+    # Cycle number, timestamps and presence in each cycle for each
+    # pixel; collected once per pixel, so the pair loop below does not
+    # go back to the full data
+    pixel_data = {}
+    for pixel in pixels_in_pairs.tolist():
+        tdc, pix_c = tdc_of_pixel[pixel], col_of_pixel[pixel]
+        positions = np.flatnonzero(pixel_addresses[tdc] == pix_c)
+        # Cycle ends are sorted, so the cycle of each timestamp is
+        # found with a binary search instead of slicing every cycle
+        cycle = np.searchsorted(cycle_ends, positions, side="right") - 1
+        in_data = cycle < number_of_cycles
+        positions, cycle = positions[in_data], cycle[in_data]
+        timestamps = data[tdc].T[1][positions]
+        present = np.zeros(number_of_cycles, dtype=bool)
+        present[cycle[positions > 0]] = True
+        pixel_data[pixel] = (cycle, timestamps, present)
+
+    for q, w in pairs.tolist():
+        deltas_all[f"{q},{w}"] = []
+
+        cycle_1, tmsp1_all, present_1 = pixel_data[q]
+        cycle_2, tmsp2_all, present_2 = pixel_data[w]
+
+        # Use only cycles where both pixels have data
+        both_present = present_1 & present_2
+        if not np.any(both_present):
+            continue
+
+        # Shift timestamps from each next cycle by lengths of cycles
+        # before (e.g., for the 4th cycle add 12 ms)
+        keep_1 = both_present[cycle_1] & (tmsp1_all > 0)
+        tmsp1 = tmsp1_all[keep_1] + cycle_length * cycle_1[keep_1]
+
+        keep_2 = both_present[cycle_2] & (tmsp2_all > 0)
+        tmsp2 = tmsp2_all[keep_2] + cycle_length * cycle_2[keep_2]
+
+        delta_ts = _neighbour_differences(tmsp1, tmsp2, delta_window)
+
+        deltas_all[f"{q},{w}"].extend(delta_ts)
 
     return deltas_all
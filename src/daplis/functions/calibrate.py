@@ -768,14 +768,14 @@ def load_calibration_data(
         include_offset is True.
     """
 
-    path_to_backup = os.getcwd()
-    os.chdir(calibration_path)
-
     # Compensating for TDC nonlinearities
     try:
         file_TDC = glob.glob(
-            f"*TDC_{daughterboard_number}_{motherboard_number}"
-            f"_{firmware_version}*"
+            os.path.join(
+                calibration_path,
+                f"*TDC_{daughterboard_number}_{motherboard_number}"
+                f"_{firmware_version}*",
+            )
         )[0]
     except IndexError as exc:
         raise FileNotFoundError(
@@ -787,8 +787,11 @@ def load_calibration_data(
     if include_offset:
         try:
             file_offset = glob.glob(
-                f"*Offset_{daughterboard_number}_{motherboard_number}"
-                f"_{firmware_version}*"
+                os.path.join(
+                    calibration_path,
+                    f"*Offset_{daughterboard_number}_{motherboard_number}"
+                    f"_{firmware_version}*",
+                )
             )[0]
         except IndexError:
             raise FileNotFoundError(
@@ -802,6 +805,4 @@ def load_calibration_data(
     # Cut the first column which is pixel numbers
     data_matrix_TDC = np.delete(data_matrix_TDC, 0, axis=1)
 
-    os.chdir(path_to_backup)
-
     return (data_matrix_TDC, offset_arr) if include_offset else data_matrix_TDC
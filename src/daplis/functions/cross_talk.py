@@ -29,14 +29,16 @@ functions:
 
 """
 
+import functools
 import glob
 import os
 import pickle
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import numpy as np
-import pandas as pd
+import pyarrow as pa
 from matplotlib import pyplot as plt
 from pyarrow import feather as ft
 from scipy.optimize import curve_fit
@@ -47,6 +49,91 @@ from daplis.functions import sensor_plot
 from daplis.functions import unpack as f_up
 from daplis.functions import utils
 
+# Matrices of pixel coordinates for each firmware version, where rows
+# are numbers of TDCs and columns are the pixels that connected to
+# these TDCs
+_PIX_COOR = {
+    "2212s": np.arange(256).reshape(4, 64).T,
+    "2212b": np.arange(256).reshape(64, 4),
+}
+
+
+def _collect_cross_talk_from_file(
+    file: str,
+    daughterboard_number: str,
+    motherboard_number: str,
+    firmware_version: str,
+    timestamps: int,
+    include_offset: bool,
+    apply_calibration: bool,
+    absolute_timestamps: bool,
+    pixels: List[List[int]],
+    pix_coor: np.ndarray,
+    delta_window: float,
+):
+    """Unpack a single data file and collect timestamp differences.
+
+    Parameters
+    ----------
+    file : str
+        Absolute path to the '.dat' data file.
+    daughterboard_number : str
+        LinoSPAD2 daughterboard number.
+    motherboard_number : str
+        LinoSPAD2 motherboard (FPGA) number, including the '#'.
+    firmware_version : str
+        LinoSPAD2 firmware version.
+    timestamps : int
+        Number of timestamps per TDC per cycle used during data
+        collection.
+    include_offset : bool
+        Switch for including the offset calibration.
+    apply_calibration : bool
+        If True, apply calibration to the collected data.
+    absolute_timestamps : bool
+        Indicator of data collected with absolute timestamps.
+    pixels : List[List[int]]
+        List of two lists, the first with the aggressor pixel and the
+        second with the rest of the pixels.
+    pix_coor : np.ndarray
+        Matrix of pixel coordinates, where rows are numbers of TDCs
+        and columns are the pixels that connected to these TDCs.
+    delta_window : float
+        Window size for collecting timestamp differences.
+
+    Returns
+    -------
+    dict
+        Dictionary containing timestamp differences for each pair of
+        pixels.
+    """
+    # Unpack data for the requested pixels into dictionary
+    if not absolute_timestamps:
+        data_all = f_up.unpack_binary_data(
+            file,
+            daughterboard_number,
+            motherboard_number,
+            firmware_version,
+            timestamps,
+            include_offset,
+            apply_calibration,
+        )
+    else:
+        data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
+            file,
+            daughterboard_number,
+            motherboard_number,
+            firmware_version,
+            timestamps,
+            include_offset,
+            apply_calibration,
+        )
+
+    # Collect timestamp differences for the given pixels
+    return cd.calculate_differences_2212_fast(
+        data_all, pixels, pix_coor, delta_window
+    )
+
 
 def _collect_cross_talk(
     path: str,
@@ -61,6 +148,7 @@ def _collect_cross_talk(
     apply_calibration: bool = True,
     absolute_timestamps: bool = False,
     correct_pix_address: bool = False,
+    number_of_threads: int = 4,
 ):
     """Collect timestamp differences from cross-talk data.
 
@@ -102,6 +190,9 @@ def _collect_cross_talk(
     correct_pix_address : bool, optional
         Correct pixel address for the FPGA board on side 23. Here
         used to reverse the correction. The default is False.
+    number_of_threads : int, optional
+        Number of threads for processing the data files in parallel.
+        The default is 4.
 
     Raises
     ------
@@ -126,7 +217,6 @@ def _collect_cross_talk(
         raise TypeError("'rewrite' should be boolean")
     if isinstance(daughterboard_number, str) is False:
         raise TypeError("'daughterboard_number' should be string")
-    os.chdir(path)
 
     # If requested, get the correct pixel address - must be used
     # for the motherboard on side '23'
@@ -137,11 +227,18 @@ def _collect_cross_talk(
             else:
                 pixels[i] = pixels[i] + 128
 
-    # files_all = sorted(glob.glob("*.dat*"))
-    files_all = glob.glob("*.dat*")
+    # Full paths to the data files, so the working directory is never
+    # changed
+    files_all = glob.glob(os.path.join(path, "*.dat*"))
     files_all.sort(key=os.path.getmtime)
 
-    out_file_name = files_all[0][:-4] + "-" + files_all[-1][:-4]
+    out_file_name = (
+        os.path.basename(files_all[0])[:-4]
+        + "-"
+        + os.path.basename(files_all[-1])[:-4]
+    )
+
+    os.makedirs(os.path.join(path, "cross_talk_data"), exist_ok=True)
 
     feather_file = os.path.join(
         path,
@@ -151,96 +248,64 @@ def _collect_cross_talk(
 
     utils.file_rewrite_handling(feather_file, rewrite)
 
-    # Define matrix of pixel coordinates, where rows are numbers of TDCs
-    # and columns are the pixels that connected to these TDCs
-    if firmware_version == "2212s":
-        pix_coor = np.arange(256).reshape(4, 64).T
-    elif firmware_version == "2212b":
+    # Matrix of pixel coordinates for the firmware version
+    if firmware_version == "2212b":
         print(
             "\nFor firmware version '2212b' cross-talk numbers "
             "would be incorrect, try data collected with '2212s'"
         )
         sys.exit()
-    else:
+    elif firmware_version not in _PIX_COOR:
         print("\nFirmware version is not recognized.")
         sys.exit()
+    pix_coor = _PIX_COOR[firmware_version]
 
     pixels_formatted = [[pixels[0]], pixels[1:]]
 
-    for i in tqdm(range(len(files_all)), desc="Collecting data"):
-        file = files_all[i]
-
-        # Prepare a dictionary for output
-        deltas_all = {}
-
-        # Unpack data for the requested pixels into dictionary
-        if not absolute_timestamps:
-            data_all = f_up.unpack_binary_data(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
-            )
-        else:
-            data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
-            )
-
-        # Collect timestamp differences for the given pixels
-        # deltas_all = cd.calculate_differences_2212(
-        #     data_all, pixels_formatted, pix_coor, delta_window
-        # )
-        deltas_all = cd.calculate_differences_2212_fast(
-            data_all, pixels_formatted, pix_coor, delta_window
-        )
-
-        # Save data as a .feather file in a cycle so data is not lost
-        # in the case of failure close to the end
-        data_for_plot_df = pd.DataFrame.from_dict(deltas_all, orient="index")
-        del deltas_all
-        data_for_plot_df = data_for_plot_df.T
-        try:
-            os.chdir("cross_talk_data")
-        except FileNotFoundError:
-            os.mkdir("cross_talk_data")
-            os.chdir("cross_talk_data")
-
-        # Check if feather file exists
-        feather_file = (
-            f"{out_file_name}_pixels_{pixels[0]}-{pixels[-1]}.feather"
-        )
-        if os.path.isfile(feather_file):
-            # Load existing feather file
-            existing_data = ft.read_feather(feather_file)
-
-            # Append new data to the existing feather file
-            combined_data = pd.concat(
-                [existing_data, data_for_plot_df], axis=0
-            )
-            ft.write_feather(combined_data, feather_file)
+    # Unpacking and calculating differences is independent for each
+    # file, so the files are processed in a pool of threads, while
+    # the results are saved in the original order of the files
+    process_file = functools.partial(
+        _collect_cross_talk_from_file,
+        daughterboard_number=daughterboard_number,
+        motherboard_number=motherboard_number,
+        firmware_version=firmware_version,
+        timestamps=timestamps,
+        include_offset=include_offset,
+        apply_calibration=apply_calibration,
+        absolute_timestamps=absolute_timestamps,
+        pixels=pixels_formatted,
+        pix_coor=pix_coor,
+        delta_window=delta_window,
+    )
 
-        else:
-            # Save as a new feather file
-            ft.write_feather(data_for_plot_df, feather_file)
-        os.chdir("..")
+    # The '.feather' file is kept open and the data from each file is
+    # appended as it is processed, so data is not lost in the case of
+    # failure close to the end
+    writer = None
+    try:
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            for deltas_all in tqdm(
+                executor.map(process_file, files_all),
+                total=len(files_all),
+                desc="Collecting data",
+            ):
+                data_for_plot = utils.deltas_to_table(deltas_all)
+                del deltas_all
+
+                if writer is None:
+                    writer = pa.ipc.new_file(
+                        feather_file,
+                        data_for_plot.schema,
+                        options=pa.ipc.IpcWriteOptions(compression="zstd"),
+                    )
+                writer.write_table(data_for_plot)
+    finally:
+        if writer is not None:
+            writer.close()
 
     # Check, if the file was created
-    if (
-        os.path.isfile(
-            path + f"/cross_talk_data/{out_file_name}_pixels_"
-            f"{pixels[0]}-{pixels[-1]}.feather"
-        )
-        is True
-    ):
+    if os.path.isfile(feather_file) is True:
         print(
             "\n> > > Timestamp differences are saved as"
             f"{out_file_name}_pixels_{pixels[0]}-{pixels[-1]}.feather in "
@@ -301,18 +366,23 @@ def _plot_cross_talk_peaks(
         probabilities and the second - the corresponding errors.
     """
 
-    os.chdir(path)
     if feather_file_name == "":
-        files_all1 = glob.glob("*.dat")
+        files_all1 = glob.glob(os.path.join(path, "*.dat"))
         files_all1.sort(key=os.path.getmtime)
-        ft_file_name = files_all1[0][:-4] + "-" + files_all1[-1][:-4]
+        ft_file_name = (
+            os.path.basename(files_all1[0])[:-4]
+            + "-"
+            + os.path.basename(files_all1[-1])[:-4]
+        )
     else:
         ft_file_name = feather_file_name
 
-    os.chdir(os.path.join(path, "cross_talk_data"))
-
     ft_file = glob.glob(
-        f"{ft_file_name}_*{pixels[0]}" f"-{pixels[-1]}*.feather"
+        os.path.join(
+            path,
+            "cross_talk_data",
+            f"{ft_file_name}_*{pixels[0]}-{pixels[-1]}*.feather",
+        )
     )[0]
 
     ct_output = {}
@@ -412,13 +482,12 @@ def _plot_cross_talk_peaks(
         plt.xlabel("\u0394t (ps)")
         plt.ylabel("# of coincidences (-)")
         plt.legend()
-        try:
-            os.chdir(os.path.join(path, "results/ct_fit"))
-        except FileNotFoundError as _:
-            os.makedirs(os.path.join(path, "results/ct_fit"))
-            os.chdir(os.path.join(path, "results/ct_fit"))
-        plt.savefig(f"CT_fit_pixels_{pixels[0]},{pix}.png")
-        os.chdir(os.path.join(path, "cross_talk_data"))
+        os.makedirs(os.path.join(path, "results/ct_fit"), exist_ok=True)
+        plt.savefig(
+            os.path.join(
+                path, "results/ct_fit", f"CT_fit_pixels_{pixels[0]},{pix}.png"
+            )
+        )
 
         if show_plots:
             plt.show()
@@ -466,19 +535,24 @@ def _plot_cross_talk_grid(
         Switch for showing the plots at the end. The default is False.
     """
 
-    os.chdir(path)
     if feather_file_name == "":
-        files_all1 = glob.glob("*.dat")
+        files_all1 = glob.glob(os.path.join(path, "*.dat"))
         files_all1.sort(key=os.path.getmtime)
-        ft_file_name = files_all1[0][:-4] + "-" + files_all1[-1][:-4]
+        ft_file_name = (
+            os.path.basename(files_all1[0])[:-4]
+            + "-"
+            + os.path.basename(files_all1[-1])[:-4]
+        )
     else:
         ft_file_name = feather_file_name
 
-    os.chdir(os.path.join(path, "cross_talk_data"))
-
-    ft_file = glob.glob(f"{ft_file_name}_*{pixels[0]}-{pixels[-1]}*.feather")[
-        0
-    ]
+    ft_file = glob.glob(
+        os.path.join(
+            path,
+            "cross_talk_data",
+            f"{ft_file_name}_*{pixels[0]}-{pixels[-1]}*.feather",
+        )
+    )[0]
 
     fig, axes = plt.subplots(4, 5, figsize=(16, 10))
     plt.rcParams.update({"font.size": 27})
@@ -585,13 +659,14 @@ def _plot_cross_talk_grid(
     # Make plots tight
     plt.tight_layout()
 
-    try:
-        os.chdir(os.path.join(path, "results/ct_fit"))
-    except FileNotFoundError:
-        os.makedirs(os.path.join(path, "results/ct_fit"))
-        os.chdir(os.path.join(path, "results/ct_fit"))
-    plt.savefig(f"CT_fit_pixels_{pixels[0]},{pix}_grid.png")
-    os.chdir(os.path.join(path, "cross_talk_data"))
+    os.makedirs(os.path.join(path, "results/ct_fit"), exist_ok=True)
+    plt.savefig(
+        os.path.join(
+            path,
+            "results/ct_fit",
+            f"CT_fit_pixels_{pixels[0]},{pix}_grid.png",
+        )
+    )
 
     if show_plots:
         plt.show()
@@ -648,28 +723,24 @@ def collect_dcr_by_file(
     if not isinstance(motherboard_number, str):
         raise TypeError("'motherboard_number' should be a string")
 
-    os.chdir(path)
-
-    files = glob.glob("*.dat*")
+    files = glob.glob(os.path.join(path, "*.dat*"))
     files = sorted(files)
 
-    output_file_name = files[0][:-4] + "-" + files[-1][:-4]
+    output_file_name = (
+        os.path.basename(files[0])[:-4]
+        + "-"
+        + os.path.basename(files[-1])[:-4]
+    )
 
-    valid_per_pixel = np.zeros(256)
+    # Matrix of pixel coordinates for the firmware version
+    if firmware_version not in _PIX_COOR:
+        print("\nFirmware version is not recognized.")
+        sys.exit()
+    pix_coor = _PIX_COOR[firmware_version]
 
     dcr = []
 
     for i in tqdm(range(len(files)), desc="Going through files"):
-        # Define matrix of pixel coordinates, where rows are numbers of TDCs
-        # and columns are the pixels that connected to these TDCs
-        if firmware_version == "2212s":
-            pix_coor = np.arange(256).reshape(4, 64).T
-        elif firmware_version == "2212b":
-            pix_coor = np.arange(256).reshape(64, 4)
-        else:
-            print("\nFirmware version is not recognized.")
-            sys.exit()
-
         # Unpack the data; offset calibration is not necessary
         data = f_up.unpack_binary_data(
             files[i],
@@ -681,11 +752,7 @@ def collect_dcr_by_file(
         )
 
         # Collect number of timestamps in each pixel - DCR
-        for i in range(256):
-            tdc, pix = np.argwhere(pix_coor == i)[0]
-            ind = np.where(data[tdc].T[0] == pix)[0]
-            ind1 = np.where(data[tdc].T[1][ind] > 0)[0]
-            valid_per_pixel[i] = len(data[tdc].T[1][ind[ind1]])
+        valid_per_pixel = utils.count_valid_timestamps(data, pix_coor)
 
         acq_window_length = np.max(data[:].T[1]) * 1e-12
         number_of_cycles = len(np.where(data[0].T[0] == -2)[0])
@@ -695,19 +762,15 @@ def collect_dcr_by_file(
     dcr = np.array(dcr)
 
     # Save the results into a .pkl file
-    try:
-        os.chdir("dcr_data")
-    except FileNotFoundError:
-        os.mkdir("dcr_data")
-        os.chdir("dcr_data")
+    os.makedirs(os.path.join(path, "dcr_data"), exist_ok=True)
 
     file_with_dcr = f"{output_file_name}_dcr_data.pkl"
+    absolute_address = os.path.join(path, "dcr_data", file_with_dcr)
 
-    with open(file_with_dcr, "wb") as f:
+    with open(absolute_address, "wb") as f:
         pickle.dump(dcr, f)
 
     # Check, if the file was created
-    absolute_address = os.path.join(path, "dcr_data", file_with_dcr)
     if os.path.isfile(absolute_address) is True:
         print(f"\n> > > DCR data are saved in {absolute_address} < < <")
     else:
@@ -763,23 +826,23 @@ def plot_dcr_histogram_and_stability(
         Raised if the .pkl file with the DCR data was not found.
     """
 
-    os.chdir(path)
-
     # Collect all files in the given folder
-    files = glob.glob("*.dat")
+    files = glob.glob(os.path.join(path, "*.dat"))
     files = sorted(files)
 
     # Find the file with the DCR data for the found files
-    dcr_file_name = files[0][:-4] + "-" + files[-1][:-4]
+    dcr_file_name = (
+        os.path.basename(files[0])[:-4]
+        + "-"
+        + os.path.basename(files[-1])[:-4]
+    )
     file_with_dcr = f"{dcr_file_name}_dcr_data.pkl"
 
-    try:
-        os.chdir("dcr_data")
-    except FileNotFoundError:
+    if not os.path.isdir(os.path.join(path, "dcr_data")):
         raise FileNotFoundError("The folder with DCR data was not found.")
 
     try:
-        with open(file_with_dcr, "rb") as f:
+        with open(os.path.join(path, "dcr_data", file_with_dcr), "rb") as f:
             data = pickle.load(f)
     except FileNotFoundError:
         raise FileNotFoundError(f"{file_with_dcr} was not found")
@@ -802,12 +865,9 @@ def plot_dcr_histogram_and_stability(
     plt.legend(loc="best")
 
     # Save the plot to "results/dcr"
-    try:
-        os.chdir("../results/dcr")
-    except FileNotFoundError:
-        os.makedirs("../results/dcr")
-        os.chdir("../results/dcr")
-    plt.savefig("DCR_stability_graph.png")
+    results_path = os.path.join(path, "results", "dcr")
+    os.makedirs(results_path, exist_ok=True)
+    plt.savefig(os.path.join(results_path, "DCR_stability_graph.png"))
 
     # DCR histogram with integral
     # Compute the histogram
@@ -842,7 +902,7 @@ def plot_dcr_histogram_and_stability(
     # plt.show()
 
     # Save the plot to "results/dcr"
-    fig.savefig("DCR_histogram_w_integral.png")
+    fig.savefig(os.path.join(results_path, "DCR_histogram_w_integral.png"))
 
 
 def _calculate_and_plot_cross_talk(
@@ -1103,6 +1163,7 @@ def zero_to_cross_talk_collect(
     apply_calibration: bool = True,
     absolute_timestamps: bool = False,
     correct_pix_address: bool = False,
+    number_of_threads: int = 4,
 ):
     """Collect timestamp differences from cross-talk data.
 
@@ -1145,6 +1206,9 @@ def zero_to_cross_talk_collect(
     correct_pix_address : bool, optional
         Correct pixel address for the FPGA board on side 23. Here
         used to reverse the correction. The default is False.
+    number_of_threads : int, optional
+        Number of threads for processing the data files in parallel.
+        The default is 4.
     """
 
     # Define matrix of pixel coordinates, where rows are numbers of TDCs
@@ -1215,6 +1279,7 @@ def zero_to_cross_talk_collect(
             apply_calibration,
             absolute_timestamps,
             correct_pix_address,
+            number_of_threads,
         )
 
     for pixels in pixels_minus_20:
@@ -1235,6 +1300,7 @@ def zero_to_cross_talk_collect(
             apply_calibration,
             absolute_timestamps,
             correct_pix_address,
+            number_of_threads,
         )
 
 
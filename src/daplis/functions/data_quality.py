@@ -550,25 +550,18 @@ def _extend_spread_range(spread_bins, spread_counts, extension: int):
     # Calculate the step size between elements
     step_size = spread_bins[1] - spread_bins[0]
 
-    # Create arrays to add on both sides
-    left_extension = np.arange(
-        spread_bins[0] - extension * step_size,
-        spread_bins[0],
-        step_size,
-    )
-    right_extension = np.arange(
-        spread_bins[-1] + step_size,
-        spread_bins[-1] + (extension + 1) * step_size,
-        step_size,
-    )
-
-    # Concatenate arrays
-    extended_array = np.concatenate(
-        (left_extension, spread_bins, right_extension)
-    )
-    extended_counts = np.concatenate(
-        (np.zeros(extension), spread_counts, np.zeros(extension))
+    # Pad both sides with bins of the same size, ramping linearly to
+    # the new ends, and with zero counts
+    extended_array = np.pad(
+        spread_bins,
+        extension,
+        mode="linear_ramp",
+        end_values=(
+            spread_bins[0] - extension * step_size,
+            spread_bins[-1] + extension * step_size,
+        ),
     )
+    extended_counts = np.pad(spread_counts, extension, mode="constant")
 
     return extended_array, extended_counts
 
@@ -581,6 +574,7 @@ def sigma_of_count_spread_to_average(
     step: int = 10,
     bins_sigma: int = 20,
     extend: int = 0,
+    plot: bool = True,
 ):
     """Plot and fit background spread from the feather file.
 
@@ -613,45 +607,73 @@ def sigma_of_count_spread_to_average(
     extend: int, optional
         Number of elements to add to the background spread histogram
         for a better fit. The default is 0, when no elements are added.
-    """
-    os.chdir(path)
+    plot : bool, optional
+        Switch for plotting and saving the histograms. When False, only
+        the ratio is calculated. The default is True.
 
-    ft_file = glob.glob("*.feather")[0]
+    Returns
+    -------
+    float
+        Ratio of the sigma of the background spread to the average
+        background signal, in %.
+    """
+    ft_file = glob.glob(os.path.join(path, "*.feather"))[0]
 
-    ft_file_name = ft_file.split(".")[0]
+    ft_file_name = os.path.basename(ft_file).split(".")[0]
 
-    data = ft.read_feather(ft_file)
+    # Read only the column with the requested pair of pixels
+    pair_column = f"{pixels[0]},{pixels[1]}"
+    data = ft.read_feather(ft_file, columns=[pair_column])
 
-    data_cut = data[f"{pixels[0]},{pixels[1]}"]
+    data_cut = data[pair_column].to_numpy()
 
     # Cut the data from the background only; without the offset
     # calibration, the delta t peak rarely goes outside the 10 ns mark
-    data_cut = data_cut[(data_cut > range_left) & (data_cut < range_right)]
+    data_cut = data_cut[
+        np.logical_and(data_cut > range_left, data_cut < range_right)
+    ]
 
-    # Bins in units of 17.857 ps of the average LinoSPAD2 TDC bin width
-    bins = np.arange(
-        np.min(data_cut), np.max(data_cut), 2.5 / 140 * 1e3 * step
+    # Bins in units of 17.857 ps of the average LinoSPAD2 TDC bin width,
+    # starting from the smallest difference
+    bin_width = 2.5 / 140 * 1e3 * step
+    data_min, data_max = data_cut.min(), data_cut.max()
+
+    counts, bin_edges = np.histogram(
+        data_cut, bins=np.arange(data_min, data_max, bin_width)
     )
 
-    counts, bin_edges = np.histogram(data_cut, bins=bins)
+    bin_centers = 0.5 * (bin_edges[:-1] + bin_edges[1:])
 
-    bin_centers = (bin_edges - 2.5 / 140 * 1e3 * step / 2)[1:]
+    # Histogram of the spread plus Gaussian fit
+    counts_spread, bin_edges_spread = np.histogram(counts, bins=bins_sigma)
+    bin_centers_spread = (
+        bin_edges_spread - (bin_edges_spread[1] - bin_edges_spread[0]) / 2
+    )[1:]
+
+    if extend > 0:
+        bin_centers_spread, counts_spread = _extend_spread_range(
+            bin_centers_spread, counts_spread, extend
+        )
+
+    pars, covs = utils.fit_gaussian(bin_centers_spread, counts_spread)
+
+    ratio = pars[2] / np.mean(counts) * 100
+
+    if not plot:
+        return ratio
 
     plt.rcParams.update({"font.size": 27})
 
-    try:
-        os.chdir("results/bckg_spread")
-    except Exception:
-        os.makedirs("results/bckg_spread")
-        os.chdir("results/bckg_spread")
+    results_path = os.path.join(path, "results/bckg_spread")
+    os.makedirs(results_path, exist_ok=True)
 
     # Background histogram
     plt.figure(figsize=(16, 10))
     plt.step(bin_centers, counts, color="tomato")
-    plt.title(f"Histogram of delta ts\nBin size is {bins[1] - bins[0]:.2f} ps")
+    plt.title(f"Histogram of delta ts\nBin size is {bin_width:.2f} ps")
     plt.xlabel(r"$\Delta$t (ps)")
     plt.ylabel("# of coincidences (-)")
-    plt.savefig(f"{ft_file_name}_bckg_hist.png")
+    plt.savefig(os.path.join(results_path, f"{ft_file_name}_bckg_hist.png"))
 
     # Seaborn join histograms of background including the spread
     sns.jointplot(
@@ -660,20 +682,9 @@ def sigma_of_count_spread_to_average(
     plt.title("Histogram of delta ts with histograms of spread", fontsize=27)
     plt.xlabel(r"$\Delta$t (ps)", fontsize=27)
     plt.ylabel("# of coincidences (-)", fontsize=27)
-    plt.savefig(f"{ft_file_name}_bckg_hist_joint.png")
-
-    # Histogram of the spread plus Gaussian fit
-    counts_spread, bin_edges_spread = np.histogram(counts, bins=bins_sigma)
-    bin_centers_spread = (
-        bin_edges_spread - (bin_edges_spread[1] - bin_edges_spread[0]) / 2
-    )[1:]
-
-    if extend > 0:
-        bin_centers_spread, counts_spread = _extend_spread_range(
-            bin_centers_spread, counts_spread, extend
-        )
-
-    pars, covs = utils.fit_gaussian(bin_centers_spread, counts_spread)
+    plt.savefig(
+        os.path.join(results_path, f"{ft_file_name}_bckg_hist_joint.png")
+    )
 
     fig, ax = plt.subplots(figsize=(16, 10))
     ax.step(
@@ -688,9 +699,7 @@ def sigma_of_count_spread_to_average(
         label="Fit",
         color="#cc8c32",
     )
-    ax.set_title(
-        f"Ratio of spread to average: {pars[2] / np.mean(counts) * 100:.1f} %"
-    )
+    ax.set_title(f"Ratio of spread to average: {ratio:.1f} %")
     ax.set_xlabel("Spread (-)")
     ax.set_ylabel("Counts (-)")
     ax.text(
@@ -703,7 +712,11 @@ def sigma_of_count_spread_to_average(
             facecolor="white", edgecolor="black", boxstyle="round,pad=0.5"
         ),
     )
-    plt.savefig(f"{ft_file_name}_bckg_spread_hist_.png")
+    plt.savefig(
+        os.path.join(results_path, f"{ft_file_name}_bckg_spread_hist_.png")
+    )
+
+    return ratio
 
 
 def sigma_of_count_spread_to_average_from_ft_file(
@@ -715,6 +728,7 @@ def sigma_of_count_spread_to_average_from_ft_file(
     step: int = 10,
     bins_sigma: int = 20,
     extend: int = 0,
+    plot: bool = True,
 ):
     """Plot and fit background spread from the feather file.
 
@@ -749,44 +763,74 @@ def sigma_of_count_spread_to_average_from_ft_file(
     extend: int, optional
         Number of elements to add to the background spread histogram
         for a better fit. The default is 0, when no elements are added.
+    plot : bool, optional
+        Switch for plotting and saving the histograms. When False, only
+        the ratio is calculated. The default is True.
+
+    Returns
+    -------
+    float
+        Ratio of the sigma of the background spread to the average
+        background signal, in %.
     """
 
     ft_file_name = ft_file.split(".")[0]
 
-    os.chdir(path)
-
-    data = ft.read_feather(ft_file)
+    # Read only the column with the requested pair of pixels
+    pair_column = f"{pixel_pair[0]},{pixel_pair[1]}"
+    data = ft.read_feather(os.path.join(path, ft_file), columns=[pair_column])
 
-    data_cut = data[f"{pixel_pair[0]},{pixel_pair[1]}"]
+    data_cut = data[pair_column].to_numpy()
 
     # Cut the data from the background only; without the offset
     # calibration, the delta t peak rarely goes outside the 10 ns mark
-    data_cut = data_cut[(data_cut > range_left) & (data_cut < range_right)]
+    data_cut = data_cut[
+        np.logical_and(data_cut > range_left, data_cut < range_right)
+    ]
 
-    # Bins in units of 17.857 ps of the average LinoSPAD2 TDC bin width
-    bins = np.arange(
-        np.min(data_cut), np.max(data_cut), 2.5 / 140 * 1e3 * step
+    # Bins in units of 17.857 ps of the average LinoSPAD2 TDC bin width,
+    # starting from the smallest difference
+    bin_width = 2.5 / 140 * 1e3 * step
+    data_min, data_max = data_cut.min(), data_cut.max()
+
+    counts, bin_edges = np.histogram(
+        data_cut, bins=np.arange(data_min, data_max, bin_width)
     )
 
-    counts, bin_edges = np.histogram(data_cut, bins=bins)
+    bin_centers = 0.5 * (bin_edges[:-1] + bin_edges[1:])
+
+    # Histogram of the spread plus Gaussian fit
+    counts_spread, bin_edges_spread = np.histogram(counts, bins=bins_sigma)
+    bin_centers_spread = (
+        bin_edges_spread - (bin_edges_spread[1] - bin_edges_spread[0]) / 2
+    )[1:]
+
+    # Extend the range (if required) for the background spread for a
+    # better fit
+    if extend > 0:
+        bin_centers_spread, counts_spread = _extend_spread_range(
+            bin_centers_spread, counts_spread, extend
+        )
+
+    pars, covs = utils.fit_gaussian(bin_centers_spread, counts_spread)
+
+    ratio = pars[2] / np.mean(counts) * 100
 
-    bin_centers = (bin_edges - 2.5 / 140 * 1e3 * step / 2)[1:]
+    if not plot:
+        return ratio
 
     plt.rcParams.update({"font.size": 27})
 
-    try:
-        os.chdir("results/bckg_spread")
-    except FileNotFoundError:
-        os.makedirs("results/bckg_spread")
-        os.chdir("results/bckg_spread")
+    results_path = os.path.join(path, "results/bckg_spread")
+    os.makedirs(results_path, exist_ok=True)
 
     # Background histogram
     plt.figure(figsize=(16, 10))
     plt.step(bin_centers, counts, color="tomato")
-    plt.title(f"Histogram of delta ts\nBin size is {bins[1] - bins[0]:.2f} ps")
+    plt.title(f"Histogram of delta ts\nBin size is {bin_width:.2f} ps")
     plt.xlabel(r"$\Delta$t (ps)")
     plt.ylabel("# of coincidences (-)")
-    plt.savefig(f"{ft_file_name}_bckg_hist.png")
+    plt.savefig(os.path.join(results_path, f"{ft_file_name}_bckg_hist.png"))
 
     # Seaborn join histograms of background including the spread
     sns.jointplot(
@@ -795,22 +839,9 @@ def sigma_of_count_spread_to_average_from_ft_file(
     plt.title("Histogram of delta ts with histograms of spread", fontsize=27)
     plt.xlabel(r"$\Delta$t (ps)", fontsize=27)
     plt.ylabel("# of coincidences (-)", fontsize=27)
-    plt.savefig(f"{ft_file_name}_bckg_hist_joint.png")
-
-    # Histogram of the spread plus Gaussian fit
-    counts_spread, bin_edges_spread = np.histogram(counts, bins=bins_sigma)
-    bin_centers_spread = (
-        bin_edges_spread - (bin_edges_spread[1] - bin_edges_spread[0]) / 2
-    )[1:]
-
-    # Extend the range (if required) for the background spread for a
-    # better fit
-    if extend > 0:
-        bin_centers_spread, counts_spread = _extend_spread_range(
-            bin_centers_spread, counts_spread, extend
-        )
-
-    pars, covs = utils.fit_gaussian(bin_centers_spread, counts_spread)
+    plt.savefig(
+        os.path.join(results_path, f"{ft_file_name}_bckg_hist_joint.png")
+    )
 
     fig, ax = plt.subplots(figsize=(16, 10))
     ax.step(
@@ -825,9 +856,7 @@ def sigma_of_count_spread_to_average_from_ft_file(
         label="Fit",
         color="#cc8c32",
     )
-    ax.set_title(
-        f"Ratio of spread to average: {pars[2] / np.mean(counts) * 100:.1f} %"
-    )
+    ax.set_title(f"Ratio of spread to average: {ratio:.1f} %")
     ax.set_xlabel("Spread (-)")
     ax.set_ylabel("Counts (-)")
     ax.text(
@@ -840,4 +869,8 @@ def sigma_of_count_spread_to_average_from_ft_file(
             facecolor="white", edgecolor="black", boxstyle="round,pad=0.5"
         ),
     )
-    plt.savefig(f"{ft_file_name}_bckg_spread_hist_.png")
+    plt.savefig(
+        os.path.join(results_path, f"{ft_file_name}_bckg_spread_hist_.png")
+    )
+
+    return ratio
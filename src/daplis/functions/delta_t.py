@@ -47,16 +47,18 @@ functions:
     Can be used to presaved '.pkl' files for fine control over the plot.
 """
 
+import functools
 import glob
 import os
 import pickle
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
 from typing import List
 from warnings import warn
 
 import numpy as np
-import pandas as pd
+import pyarrow as pa
 from matplotlib import pyplot as plt
 from pyarrow import feather as ft
 from tqdm import tqdm
@@ -65,6 +67,9 @@ from daplis.functions import calc_diff as cd
 from daplis.functions import unpack as f_up
 from daplis.functions import utils
 
+# Average bin width of the LinoSPAD2 TDCs in ps
+_TDC_BIN_WIDTH = 2500 / 140
+
 
 def _flatten(input_list: List):
     """Flatten the input list.
@@ -93,66 +98,208 @@ def _flatten(input_list: List):
     return flattened
 
 
-def _combine_intermediate_feather_files(path: str, skip_data: bool = False):
-    """Combine intermediate '.feather' files into one.
+def _bincount_histogram(data: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """Histogram data into equally spaced bins using bincount.
 
-    Find all numbered '.feather' files for the data files found in the
-    path and combine them all into one.
+    Bin index is calculated directly from the bin width, corrected by
+    one where floating point rounding puts a value on the wrong side
+    of an edge, and counted with a single np.bincount pass. Gives
+    the same counts as np.histogram(data, bins) for equally spaced
+    bins, including the closed last bin.
 
     Parameters
     ----------
-    path : str
-        Path to the folder with the '.dat' data files.
-    skip_data : bool
-        Switch for skipping the data and working directly in the
-        'delta_ts_data' folder. Can be used when the raw '.dat' files
-        are not available or the data set is incomplete. The default is
-        False.
+    data : np.ndarray
+        Timestamp differences to histogram.
+    bins : np.ndarray
+        Equally spaced bin edges, e.g., from np.arange.
 
-    Raises
-    ------
-    FileNotFoundError
-        Raised when the folder "delta_ts_data", where timestamp
-        differences are saved, cannot be found in the path.
+    Returns
+    -------
+    np.ndarray
+        Counts in each bin.
     """
+    number_of_bins = len(bins) - 1
+    if number_of_bins < 1:
+        return np.zeros(0, dtype=np.intp)
+
+    data = data[(data >= bins[0]) & (data <= bins[-1])]
+    bin_width = (bins[-1] - bins[0]) / number_of_bins
+
+    bin_index = ((data - bins[0]) / bin_width).astype(np.intp)
+    bin_index = np.clip(bin_index, 0, number_of_bins - 1)
+    # Correct the index for values that rounding put into a
+    # neighbouring bin
+    bin_index -= data < bins[bin_index]
+    bin_index += (data >= bins[bin_index + 1]) & (
+        bin_index < number_of_bins - 1
+    )
 
-    os.chdir(path)
+    return np.bincount(bin_index, minlength=number_of_bins)
 
-    if not skip_data:
-        files_all = sorted(glob.glob("*.dat*"))
-        if files_all != []:
-            feather_file_name = files_all[0][:-4] + "-" + files_all[-1][:-4]
-            combined_feather_file_name = feather_file_name
-        else:
-            feather_file_name = ""
-            combined_feather_file_name = "combined"
-    else:
-        feather_file_name = ""
-        combined_feather_file_name = "combined"
 
-    try:
-        os.chdir("delta_ts_data")
-    except FileNotFoundError:
-        raise FileNotFoundError(
-            "Folder with saved timestamp differences was not found"
+def _unpack_file(
+    file: str,
+    daughterboard_number: str,
+    motherboard_number: str,
+    firmware_version: str,
+    timestamps: int,
+    include_offset: bool,
+    apply_calibration: bool,
+    absolute_timestamps: bool,
+) -> np.ndarray:
+    """Unpack a single data file, with or without absolute timestamps.
+
+    Parameters
+    ----------
+    file : str
+        Path to the '.dat' data file.
+    daughterboard_number : str
+        LinoSPAD2 daughterboard number.
+    motherboard_number : str
+        LinoSPAD2 motherboard (FPGA) number, including the '#'.
+    firmware_version : str
+        LinoSPAD2 firmware version.
+    timestamps : int
+        Number of timestamps per acquisition cycle per pixel.
+    include_offset : bool
+        Switch for applying offset calibration.
+    apply_calibration : bool
+        Switch for applying TDC and offset calibration.
+    absolute_timestamps : bool
+        Indicator for data with absolute timestamps.
+
+    Returns
+    -------
+    np.ndarray
+        Unpacked data, see unpack.unpack_binary_data.
+    """
+    if not absolute_timestamps:
+        return f_up.unpack_binary_data(
+            file,
+            daughterboard_number,
+            motherboard_number,
+            firmware_version,
+            timestamps,
+            include_offset,
+            apply_calibration,
         )
 
-    file_pattern = f"{feather_file_name}*_*.feather"
+    data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
+        file,
+        daughterboard_number,
+        motherboard_number,
+        firmware_version,
+        timestamps,
+        include_offset,
+        apply_calibration,
+    )
+    return data_all
+
+
+def _collect_deltas_from_file(
+    file: str,
+    daughterboard_number: str,
+    motherboard_number: str,
+    firmware_version: str,
+    timestamps: int,
+    include_offset: bool,
+    apply_calibration: bool,
+    absolute_timestamps: bool,
+    pixels: List[int] | List[List[int]],
+    pix_coor: np.ndarray,
+    delta_window: float,
+    cycle_length: float,
+) -> pa.Table:
+    """Unpack a single data file and calculate timestamp differences.
+
+    Parameters
+    ----------
+    file : str
+        Path to the '.dat' data file.
+    daughterboard_number : str
+        LinoSPAD2 daughterboard number.
+    motherboard_number : str
+        LinoSPAD2 motherboard (FPGA) number, including the '#'.
+    firmware_version : str
+        LinoSPAD2 firmware version.
+    timestamps : int
+        Number of timestamps per acquisition cycle per pixel.
+    include_offset : bool
+        Switch for applying offset calibration.
+    apply_calibration : bool
+        Switch for applying TDC and offset calibration.
+    absolute_timestamps : bool
+        Indicator for data with absolute timestamps.
+    pixels : List[int] | List[List[int]]
+        List of pixel numbers for which the timestamp differences
+        should be calculated.
+    pix_coor : np.ndarray
+        Matrix of pixel coordinates, where rows are numbers of TDCs
+        and columns are the pixels that connected to these TDCs.
+    delta_window : float
+        Size of a window to which timestamp differences are compared.
+    cycle_length : float
+        Length of the acquisition cycle.
+
+    Returns
+    -------
+    pa.Table
+        Table with a column of timestamp differences for each pair of
+        pixels.
+    """
+    data_all = _unpack_file(
+        file,
+        daughterboard_number,
+        motherboard_number,
+        firmware_version,
+        timestamps,
+        include_offset,
+        apply_calibration,
+        absolute_timestamps,
+    )
 
-    feather_files = glob.glob(file_pattern)
+    delta_ts = cd.calculate_differences_2212_fast(
+        data_all, pixels, pix_coor, delta_window, cycle_length
+    )
 
-    data_combined = []
-    data_combined = pd.DataFrame(data_combined)
+    return utils.deltas_to_table(delta_ts)
 
-    for ft_file in feather_files:
-        data = ft.read_feather(ft_file)
 
-        data_combined = pd.concat([data_combined, data], ignore_index=True)
+def _set_grid_margins(fig, grid_size: int):
+    """Set fixed margins and spacing of a grid of delta t histograms.
 
-        data_combined.to_feather(f"{combined_feather_file_name}.feather")
+    Replaces 'tight_layout', which measures every label of every
+    subplot. The margins and gaps are fixed in inches, leaving space
+    for the axis labels and tick labels at font size 27, and converted
+    to the fractions 'subplots_adjust' expects for the given figure.
 
-    for ft_file in feather_files:
-        os.remove(ft_file)
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        Figure with the histograms.
+    grid_size : int
+        Number of rows (and columns) of subplots.
+    """
+    width, height = fig.get_size_inches()
+    left, right, bottom, top = 2.0, 1.0, 1.4, 0.9
+    horizontal_gap, vertical_gap = 2.4, 1.8
+
+    axes_width = (
+        width - left - right - (grid_size - 1) * horizontal_gap
+    ) / grid_size
+    axes_height = (
+        height - bottom - top - (grid_size - 1) * vertical_gap
+    ) / grid_size
+
+    fig.subplots_adjust(
+        left=left / width,
+        right=1 - right / width,
+        bottom=bottom / height,
+        top=1 - top / height,
+        wspace=horizontal_gap / axes_width,
+        hspace=vertical_gap / axes_height,
+    )
 
 
 def calculate_and_save_timestamp_differences(
@@ -286,10 +433,6 @@ def calculate_and_save_timestamp_differences(
 
     out_file_name = files_all[0][:-4] + "-" + files_all[-1][:-4]
 
-    # Feather file counter for saving delta ts into separate files
-    # of up to 100 MB
-    ft_file_number = 0
-
     # Check if the feather file exists and if it should be rewrited
     feather_file = os.path.join(
         path, "delta_ts_data", f"{out_file_name}.feather"
@@ -330,76 +473,59 @@ def calculate_and_save_timestamp_differences(
             pixels[0] = [pix for pix in pixels[0] if pix not in mask]
             pixels[1] = [pix for pix in pixels[1] if pix not in mask]
 
-    for i in tqdm(range(ceil(len(files_all))), desc="Collecting data"):
-        file = files_all[i]
+    os.makedirs(os.path.join(path, "delta_ts_data"), exist_ok=True)
 
-        # Prepare a dictionary for output
-        deltas_all = {}
+    # The '.feather' file is kept open and the timestamp differences
+    # from each file are appended as they are calculated, so data is
+    # not lost in the case of failure close to the end
+    writer = None
+    try:
+        for i in tqdm(range(ceil(len(files_all))), desc="Collecting data"):
+            file = files_all[i]
+
+            # Prepare a dictionary for output
+            deltas_all = {}
+
+            # Unpack data for the requested pixels into dictionary
+            if not absolute_timestamps:
+                data_all = f_up.unpack_binary_data(
+                    file,
+                    daughterboard_number,
+                    motherboard_number,
+                    firmware_version,
+                    timestamps,
+                    include_offset,
+                    apply_calibration,
+                )
+            else:
+                data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
+                    file,
+                    daughterboard_number,
+                    motherboard_number,
+                    firmware_version,
+                    timestamps,
+                    include_offset,
+                    apply_calibration,
+                )
 
-        # Unpack data for the requested pixels into dictionary
-        if not absolute_timestamps:
-            data_all = f_up.unpack_binary_data(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
-            )
-        else:
-            data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
+            # Calculate the timestamp differences for the given pixels
+            deltas_all = cd.calculate_differences_2212(
+                data_all, pixels, pix_coor, delta_window
             )
 
-        # Calculate the timestamp differences for the given pixels
-        deltas_all = cd.calculate_differences_2212(
-            data_all, pixels, pix_coor, delta_window
-        )
+            data_for_plot = utils.deltas_to_table(deltas_all)
+            del deltas_all
 
-        # Save data as a .feather file in a cycle so data is not lost
-        # in the case of failure close to the end
-        data_for_plot_df = pd.DataFrame.from_dict(deltas_all, orient="index")
-        del deltas_all
-        data_for_plot_df = data_for_plot_df.T
-        try:
-            os.chdir("delta_ts_data")
-        except FileNotFoundError:
-            os.mkdir("delta_ts_data")
-            os.chdir("delta_ts_data")
-
-        # Check if feather file exists
-        feather_file = f"{out_file_name}_{ft_file_number}.feather"
-        if os.path.isfile(feather_file):
-            # Check the size of the existing '.feather', if larger
-            # than 100 MB, create new one
-            if os.path.getsize(feather_file) / 1024 / 1024 < 100:
-                # Load existing feather file
-                existing_data = ft.read_feather(feather_file)
-
-                # Append new data to the existing feather file
-                combined_data = pd.concat(
-                    [existing_data, data_for_plot_df], axis=0
+            if writer is None:
+                writer = pa.ipc.new_file(
+                    feather_file,
+                    data_for_plot.schema,
+                    options=pa.ipc.IpcWriteOptions(compression="zstd"),
                 )
-                ft.write_feather(combined_data, feather_file)
-            else:
-                ft_file_number += 1
-                feather_file = f"{out_file_name}_{ft_file_number}.feather"
-                ft.write_feather(data_for_plot_df, feather_file)
-
-        else:
-            # Save as a new feather file
-            ft.write_feather(data_for_plot_df, feather_file)
-        os.chdir("..")
-
-    # Combine the numbered feather files into a single one
-    _combine_intermediate_feather_files(path)
+            writer.write_table(data_for_plot)
+    finally:
+        if writer is not None:
+            writer.close()
 
     # Check, if the file was created
     if (
@@ -431,6 +557,7 @@ def calculate_and_save_timestamp_differences_fast(
     apply_calibration: bool = True,
     absolute_timestamps: bool = False,
     correct_pix_address: bool = False,
+    number_of_threads: int = 4,
 ):
     """Calculate and save timestamp differences into '.feather' file.
 
@@ -479,6 +606,9 @@ def calculate_and_save_timestamp_differences_fast(
     correct_pix_address : bool, optional
         Correct pixel address for the sensor half on side 23 of the
         daughterboard. The default is False.
+    number_of_threads : int, optional
+        Number of threads for processing the data files in parallel.
+        The default is 4.
 
     Raises
     ------
@@ -505,19 +635,20 @@ def calculate_and_save_timestamp_differences_fast(
     if isinstance(daughterboard_number, str) is False:
         raise TypeError("'daughterboard_number' should be string")
 
-    os.chdir(path)
-
     # Handle the input list
     pixels = utils.pixel_list_transform(pixels)
-    files_all = glob.glob("*.dat")
 
-    files_all = sorted(files_all)
+    # Full paths to the data files, so the worker threads do not depend
+    # on the working directory
+    files_all = glob.glob(os.path.join(path, "*.dat"))
 
-    out_file_name = files_all[0][:-4] + "-" + files_all[-1][:-4]
+    files_all = sorted(files_all)
 
-    # Feather file counter for saving delta ts into separate files
-    # of up to 100 MB
-    ft_file_number = 0
+    out_file_name = (
+        os.path.basename(files_all[0])[:-4]
+        + "-"
+        + os.path.basename(files_all[-1])[:-4]
+    )
 
     # Check if the feather file exists and if it should be rewrited
     feather_file = os.path.join(
@@ -528,9 +659,6 @@ def calculate_and_save_timestamp_differences_fast(
     # for ft_file in feather_files:
     utils.file_rewrite_handling(feather_file, rewrite)
 
-    # Go back to the folder with '.dat' files
-    os.chdir(path)
-
     # Collect the data for the required pixels
     print(
         "\n> > > Collecting data for delta t plot for the requested "
@@ -559,74 +687,62 @@ def calculate_and_save_timestamp_differences_fast(
             pixels[0] = [pix for pix in pixels[0] if pix not in mask]
             pixels[1] = [pix for pix in pixels[1] if pix not in mask]
 
-    for i in tqdm(range(ceil(len(files_all))), desc="Collecting data"):
-        file = files_all[i]
-
-        # Unpack data for the requested pixels into dictionary
-        if not absolute_timestamps:
-            data_all = f_up.unpack_binary_data(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
-            )
-        else:
-            data_all, _ = f_up.unpack_binary_data_with_absolute_timestamps(
-                file,
-                daughterboard_number,
-                motherboard_number,
-                firmware_version,
-                timestamps,
-                include_offset,
-                apply_calibration,
-            )
-
-        # If cycle_length is not given manually, estimate from the data
-        if cycle_length is None:
-            cycle_length = np.max(data_all)
-
-        delta_ts = cd.calculate_differences_2212_fast(
-            data_all, pixels, pix_coor, delta_window, cycle_length
+    os.makedirs(os.path.join(path, "delta_ts_data"), exist_ok=True)
+
+    # If cycle_length is not given manually, estimate from the data in
+    # the first file
+    if cycle_length is None:
+        data_all = _unpack_file(
+            files_all[0],
+            daughterboard_number,
+            motherboard_number,
+            firmware_version,
+            timestamps,
+            include_offset,
+            apply_calibration,
+            absolute_timestamps,
         )
+        cycle_length = np.max(data_all)
+        del data_all
+
+    # Files are unpacked and processed in parallel; the order of the
+    # files in the output is kept
+    process_file = functools.partial(
+        _collect_deltas_from_file,
+        daughterboard_number=daughterboard_number,
+        motherboard_number=motherboard_number,
+        firmware_version=firmware_version,
+        timestamps=timestamps,
+        include_offset=include_offset,
+        apply_calibration=apply_calibration,
+        absolute_timestamps=absolute_timestamps,
+        pixels=pixels,
+        pix_coor=pix_coor,
+        delta_window=delta_window,
+        cycle_length=cycle_length,
+    )
 
-        # Save data as a .feather file in a cycle so data is not lost
-        # in the case of failure close to the end
-        delta_ts = pd.DataFrame.from_dict(delta_ts, orient="index")
-        delta_ts = delta_ts.T
-
-        try:
-            os.chdir("delta_ts_data")
-        except FileNotFoundError:
-            os.mkdir("delta_ts_data")
-            os.chdir("delta_ts_data")
-
-        # Check if feather file exists
-        feather_file = f"{out_file_name}_{ft_file_number}.feather"
-        if os.path.isfile(feather_file):
-            # Check the size of the existing '.feather', if larger
-            # than 100 MB, create new one
-            if os.path.getsize(feather_file) / 1024 / 1024 < 100:
-                # Load existing feather file
-                existing_data = ft.read_feather(feather_file)
-
-                # Append new data to the existing feather file
-                combined_data = pd.concat([existing_data, delta_ts], axis=0)
-                ft.write_feather(combined_data, feather_file)
-            else:
-                ft_file_number += 1
-                feather_file = f"{out_file_name}_{ft_file_number}.feather"
-                ft.write_feather(delta_ts, feather_file)
-
-        else:
-            # Save as a new feather file
-            ft.write_feather(delta_ts, feather_file)
-        os.chdir("..")
-
-    # Combine the numbered feather files into a single one
-    _combine_intermediate_feather_files(path)
+    # The '.feather' file is kept open and the timestamp differences
+    # from each file are appended as they are calculated, so data is
+    # not lost in the case of failure close to the end
+    writer = None
+    try:
+        with ThreadPoolExecutor(max_workers=number_of_threads) as executor:
+            for delta_ts in tqdm(
+                executor.map(process_file, files_all),
+                total=len(files_all),
+                desc="Collecting data",
+            ):
+                if writer is None:
+                    writer = pa.ipc.new_file(
+                        feather_file,
+                        delta_ts.schema,
+                        options=pa.ipc.IpcWriteOptions(compression="zstd"),
+                    )
+                writer.write_table(delta_ts)
+    finally:
+        if writer is not None:
+            writer.close()
 
     # Check, if the file was created
     if (
@@ -955,9 +1071,8 @@ def calculate_and_save_timestamp_differences_full_sensor(
 
         # Save data to a feather file in a cycle so data is not lost
         # in the case of failure close to the end
-        data_for_plot_df = pd.DataFrame.from_dict(deltas_all, orient="index")
+        data_for_plot = utils.deltas_to_table(deltas_all)
         del deltas_all
-        data_for_plot_df = data_for_plot_df.T
 
         feather_file = f"{out_file_name}.feather"
 
@@ -968,18 +1083,11 @@ def calculate_and_save_timestamp_differences_full_sensor(
             os.chdir("delta_ts_data")
 
         if os.path.isfile(feather_file):
-            # Load existing Feather file
-            existing_data = ft.read_feather(feather_file)
-
             # Append new data to the existing Feather file
-            combined_data = pd.concat(
-                [existing_data, data_for_plot_df], axis=0
-            )
-            ft.write_feather(combined_data, feather_file)
+            existing_data = ft.read_table(feather_file)
+            data_for_plot = pa.concat_tables([existing_data, data_for_plot])
 
-        else:
-            # Save as a new Feather file
-            ft.write_feather(data_for_plot_df, feather_file)
+        ft.write_feather(data_for_plot, feather_file, compression="zstd")
 
         os.chdir("..")
 
@@ -1350,9 +1458,8 @@ def calculate_and_save_timestamp_differences_full_sensor_alt(
 
         # Save data to a feather file in a cycle so data is not lost
         # in the case of failure close to the end
-        data_for_plot_df = pd.DataFrame.from_dict(deltas_all, orient="index")
+        data_for_plot = utils.deltas_to_table(deltas_all)
         del deltas_all
-        data_for_plot_df = data_for_plot_df.T
 
         feather_file = f"{out_file_name}.feather"
 
@@ -1363,18 +1470,11 @@ def calculate_and_save_timestamp_differences_full_sensor_alt(
             os.chdir("delta_ts_data")
 
         if os.path.isfile(feather_file):
-            # Load existing Feather file
-            existing_data = ft.read_feather(feather_file)
-
             # Append new data to the existing Feather file
-            combined_data = pd.concat(
-                [existing_data, data_for_plot_df], axis=0
-            )
-            ft.write_feather(combined_data, feather_file)
+            existing_data = ft.read_table(feather_file)
+            data_for_plot = pa.concat_tables([existing_data, data_for_plot])
 
-        else:
-            # Save as a new Feather file
-            ft.write_feather(data_for_plot_df, feather_file)
+        ft.write_feather(data_for_plot, feather_file, compression="zstd")
 
         os.chdir("..")
 
@@ -1524,6 +1624,34 @@ def collect_and_plot_timestamp_differences(
     if same_y is True:
         y_max_all = 0
 
+    if ft_file is None:
+        ft_file = f"delta_ts_data/{feather_file_name}.feather"
+
+    # Read all requested pairs of pixels from the '.feather' file at
+    # once, decompressing the columns in parallel; pairs that are not
+    # in the file are skipped in the plot
+    with pa.memory_map(ft_file) as source:
+        available_columns = pa.ipc.open_file(source).schema.names
+    pair_columns = [
+        f"{pixels[q]},{pixels[w]}"
+        for q in range(len(pixels))
+        for w in range(q + 1, len(pixels))
+    ]
+    data_all = ft.read_feather(
+        ft_file,
+        columns=[
+            column
+            for column in dict.fromkeys(pair_columns)
+            if column in available_columns
+        ],
+        use_threads=True,
+        memory_map=False,
+    )
+
+    # Bins should be in units of 17.857 ps - average bin width of the
+    # LinoSPAD2 TDCs; only the range of the bins depends on the data
+    bin_width = _TDC_BIN_WIDTH * multiplier
+
     for q, _ in tqdm(enumerate(pixels), desc="Row in plot"):
         for w, _ in enumerate(pixels):
             if w <= q:
@@ -1531,40 +1659,23 @@ def collect_and_plot_timestamp_differences(
             if len(pixels) > 2:
                 axs[q][w - 1].axes.set_axis_on()
 
-            # Read data from Feather file
-            if ft_file is not None:
-                try:
-                    data_to_plot = ft.read_feather(
-                        ft_file, columns=[f"{pixels[q]},{pixels[w]}"]
-                    ).dropna()
-                except ValueError:
-                    continue
-            else:
-                try:
-                    data_to_plot = ft.read_feather(
-                        f"delta_ts_data/{feather_file_name}.feather",
-                        columns=[f"{pixels[q]},{pixels[w]}"],
-                    ).dropna()
-                except ValueError:
-                    continue
+            # Data for the pair of pixels
+            if f"{pixels[q]},{pixels[w]}" not in data_all:
+                continue
+            data_to_plot = data_all[f"{pixels[q]},{pixels[w]}"].dropna()
 
             # Prepare the data for the plot
             data_to_plot = np.array(data_to_plot)
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot < range_left)
-            )
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot > range_right)
-            )
+            data_to_plot = data_to_plot[
+                (data_to_plot >= range_left) & (data_to_plot <= range_right)
+            ]
             # data_to_plot = data_to_plot + 1e3
 
-            # Bins should be in units of 17.857 ps - average bin width
-            # of the LinoSPAD2 TDCs
             try:
                 bins = np.arange(
                     np.min(data_to_plot),
                     np.max(data_to_plot),
-                    2500 / 140 * multiplier,
+                    bin_width,
                 )
             except ValueError:
                 print(
@@ -1573,20 +1684,28 @@ def collect_and_plot_timestamp_differences(
                 )
                 continue
 
+            # The histogram is calculated beforehand and only drawn as
+            # bars, so the plot does not histogram the data again
+            n = _bincount_histogram(data_to_plot, bins)
+
             if len(pixels) > 2:
                 axs[q][w - 1].set_xlabel("\u0394t (ps)")
                 axs[q][w - 1].set_ylabel("# of coincidences (-)")
-                n, b, p = axs[q][w - 1].hist(
-                    data_to_plot,
-                    bins=bins,
+                axs[q][w - 1].bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
             else:
                 plt.xlabel("\u0394t (ps)")
                 plt.ylabel("# of coincidences (-)")
-                n, b, p = plt.hist(
-                    data_to_plot,
-                    bins=bins,
+                plt.bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
 
@@ -1631,24 +1750,16 @@ def collect_and_plot_timestamp_differences(
 
                 plt.title(f"Pixels {pixels[q]},{pixels[w]}")
 
-            # Save the figure
-            try:
-                os.chdir("results/delta_t")
-            except FileNotFoundError:
-                os.makedirs("results/delta_t")
-                os.chdir("results/delta_t")
-            fig.tight_layout()  # for perfect spacing between the plots
-            plt.savefig(f"{feather_file_name}_delta_t_grid.png")
-
-            os.chdir(path)
-
-    # Pickle the figure if requested
+    # Save the figure once all pairs are plotted
     try:
         os.chdir("results/delta_t")
     except FileNotFoundError:
         os.makedirs("results/delta_t")
         os.chdir("results/delta_t")
+    _set_grid_margins(fig, max(len(pixels) - 1, 1))
+    plt.savefig(f"{feather_file_name}_delta_t_grid.png")
 
+    # Pickle the figure if requested
     if pickle_figure:
         with open(f"{feather_file_name}_delta_t_grid.pkl", "wb") as f:
             pickle.dump(fig, f)
@@ -1780,6 +1891,10 @@ def collect_and_plot_timestamp_differences_from_ft_file(
     if same_y is True:
         y_max_all = 0
 
+    # Bins should be in units of 17.857 ps - average bin width of the
+    # LinoSPAD2 TDCs; only the range of the bins depends on the data
+    bin_width = _TDC_BIN_WIDTH * multiplier
+
     for q, _ in tqdm(enumerate(pixels), desc="Row in plot"):
         for w, _ in enumerate(pixels):
             if w <= q:
@@ -1798,20 +1913,15 @@ def collect_and_plot_timestamp_differences_from_ft_file(
 
             # Prepare the data for the plot
             data_to_plot = np.array(data_to_plot)
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot < range_left)
-            )
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot > range_right)
-            )
+            data_to_plot = data_to_plot[
+                (data_to_plot >= range_left) & (data_to_plot <= range_right)
+            ]
 
-            # Bins should be in units of 17.857 ps - average bin width
-            # of the LinoSPAD2 TDCs
             try:
                 bins = np.arange(
                     np.min(data_to_plot),
                     np.max(data_to_plot),
-                    2500 / 140 * multiplier,
+                    bin_width,
                 )
             except ValueError:
                 print(
@@ -1820,20 +1930,28 @@ def collect_and_plot_timestamp_differences_from_ft_file(
                 )
                 continue
 
+            # The histogram is calculated beforehand and only drawn as
+            # bars, so the plot does not histogram the data again
+            n = _bincount_histogram(data_to_plot, bins)
+
             if len(pixels) > 2:
                 axs[q][w - 1].set_xlabel("\u0394t (ps)")
                 axs[q][w - 1].set_ylabel("# of coincidences (-)")
-                n, b, p = axs[q][w - 1].hist(
-                    data_to_plot,
-                    bins=bins,
+                axs[q][w - 1].bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
             else:
                 plt.xlabel("\u0394t (ps)")
                 plt.ylabel("# of coincidences (-)")
-                n, b, p = plt.hist(
-                    data_to_plot,
-                    bins=bins,
+                plt.bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
 
@@ -1871,15 +1989,15 @@ def collect_and_plot_timestamp_differences_from_ft_file(
 
                 plt.title(f"Pixels {pixels[q]},{pixels[w]}")
 
-            # Save the figure
-            try:
-                os.chdir("results/delta_t")
-            except FileNotFoundError:
-                os.makedirs("results/delta_t")
-                os.chdir("results/delta_t")
-            fig.tight_layout()  # for perfect spacing between the plots
-            plt.savefig(f"{feather_file_name}_delta_t_grid.png")
-            os.chdir("../..")
+    # Save the figure once all pairs are plotted
+    try:
+        os.chdir("results/delta_t")
+    except FileNotFoundError:
+        os.makedirs("results/delta_t")
+        os.chdir("results/delta_t")
+    _set_grid_margins(fig, max(len(pixels) - 1, 1))
+    plt.savefig(f"{feather_file_name}_delta_t_grid.png")
+    os.chdir("../..")
 
     print(
         "\n> > > Plot is saved as {file} in {path}< < <".format(
@@ -2029,6 +2147,10 @@ def collect_and_plot_timestamp_differences_full_sensor(
     if same_y is True:
         y_max_all = 0
 
+    # Bins should be in units of 17.857 ps - average bin width of the
+    # LinoSPAD2 TDCs; only the range of the bins depends on the data
+    bin_width = _TDC_BIN_WIDTH * multiplier
+
     for q, _ in tqdm(enumerate(pixels), desc="Row in plot"):
         for w, _ in enumerate(pixels):
             if w <= q:
@@ -2062,20 +2184,15 @@ def collect_and_plot_timestamp_differences_full_sensor(
 
             # Prepare the data for the plot
             data_to_plot = np.array(data_to_plot)
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot < range_left)
-            )
-            data_to_plot = np.delete(
-                data_to_plot, np.argwhere(data_to_plot > range_right)
-            )
+            data_to_plot = data_to_plot[
+                (data_to_plot >= range_left) & (data_to_plot <= range_right)
+            ]
 
-            # Bins should be in units of 17.857 ps - average bin width
-            # of the LinoSPAD2 TDCs
             try:
                 bins = np.arange(
                     np.min(data_to_plot),
                     np.max(data_to_plot),
-                    2500 / 140 * multiplier,
+                    bin_width,
                 )
             except ValueError:
                 print(
@@ -2084,20 +2201,28 @@ def collect_and_plot_timestamp_differences_full_sensor(
                 )
                 continue
 
+            # The histogram is calculated beforehand and only drawn as
+            # bars, so the plot does not histogram the data again
+            n = _bincount_histogram(data_to_plot, bins)
+
             if len(pixels) > 2:
                 axs[q][w - 1].set_xlabel("\u0394t (ps)")
                 axs[q][w - 1].set_ylabel("# of coincidences (-)")
-                n, b, p = axs[q][w - 1].hist(
-                    data_to_plot,
-                    bins=bins,
+                axs[q][w - 1].bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
             else:
                 plt.xlabel("\u0394t (ps)")
                 plt.ylabel("# of coincidences (-)")
-                n, b, p = plt.hist(
-                    data_to_plot,
-                    bins=bins,
+                plt.bar(
+                    bins[:-1],
+                    n,
+                    width=np.diff(bins),
+                    align="edge",
                     color=color,
                 )
 
@@ -2135,17 +2260,15 @@ def collect_and_plot_timestamp_differences_full_sensor(
 
                 plt.title(f"Pixels {pixels[0]},{256 + 255 - pixels[1]}")
 
-            # Save the figure
-            try:
-                os.chdir("results/delta_t")
-            except FileNotFoundError:
-                os.makedirs("results/delta_t")
-                os.chdir("results/delta_t")
-            fig.tight_layout()  # for perfect spacing between the plots
-            plt.savefig(
-                "{name}_delta_t_grid.png".format(name=feather_file_name)
-            )
-            os.chdir("../..")
+    # Save the figure once all pairs are plotted
+    try:
+        os.chdir("results/delta_t")
+    except FileNotFoundError:
+        os.makedirs("results/delta_t")
+        os.chdir("results/delta_t")
+    _set_grid_margins(fig, max(len(pixels) - 1, 1))
+    plt.savefig("{name}_delta_t_grid.png".format(name=feather_file_name))
+    os.chdir("../..")
 
     print(
         "\n> > > Plot is saved as {file} in {path}< < <".format(
@@ -115,7 +115,8 @@ def fit_with_gaussian(
     -------
     DataFrame.
         A dataframe with fit parameters and their standard errors.
-        Returned only if the "return_fit_params" is set to True.
+        Returned only if the "return_fit_params" is set to True. For
+        pairs where the fit failed, the parameters are NaN.
 
     """
     plt.ion()
@@ -213,7 +214,19 @@ def fit_with_gaussian(
 
             bin_centers = (b - 2500 / 140 * multiplier / 2)[1:]
 
-            par, pcov = utils.fit_gaussian(bin_centers, n)
+            # A failed fit should not abort the rest of the pairs: keep
+            # NaN parameters and plot the data only
+            try:
+                par, pcov = utils.fit_gaussian(bin_centers, n)
+                fit_ok = True
+            except (RuntimeError, ValueError, TypeError):
+                print(
+                    "\nGaussian fit failed for pixels "
+                    f"{pix_left}, {pix_right}"
+                )
+                par = np.full(4, np.nan)
+                pcov = np.full((4, 4), np.nan)
+                fit_ok = False
 
             # Interpolate for smoother fit plot
             to_fit_b = np.linspace(
@@ -261,29 +274,30 @@ def fit_with_gaussian(
             plt.step(
                 b[1:],
                 n,
-                color=color_data,
-                label="data",
-            )
-            plt.plot(
-                to_fit_b,
-                to_fit_n,
-                "-",
-                color=color_fit,
-                label="fit\n"
-                "\u03C3=({p1}\u00B1{pe1}) ps\n"
-                "\u03BC=({p2}\u00B1{pe2}) ps\n"
-                "C=({contrast}\u00B1{contrast_error}) %\n"
-                "bkg={bkg}\u00B1{bkg_er}".format(
-                    p1=format(par[2], ".0f"),
-                    p2=format(par[1], ".0f"),
-                    pe1=format(perr[2], ".0f"),
-                    pe2=format(perr[1], ".0f"),
-                    bkg=format(par[3], ".0f"),
-                    bkg_er=format(perr[3], ".0f"),
-                    contrast=format(contrast, ".1f"),
-                    contrast_error=format(contrast_error, ".1f"),
-                ),
+                color=color_data if fit_ok else "grey",
+                label="data" if fit_ok else "data (fit failed)",
             )
+            if fit_ok:
+                plt.plot(
+                    to_fit_b,
+                    to_fit_n,
+                    "-",
+                    color=color_fit,
+                    label="fit\n"
+                    "\u03C3=({p1}\u00B1{pe1}) ps\n"
+                    "\u03BC=({p2}\u00B1{pe2}) ps\n"
+                    "C=({contrast}\u00B1{contrast_error}) %\n"
+                    "bkg={bkg}\u00B1{bkg_er}".format(
+                        p1=format(par[2], ".0f"),
+                        p2=format(par[1], ".0f"),
+                        pe1=format(perr[2], ".0f"),
+                        pe2=format(perr[1], ".0f"),
+                        bkg=format(par[3], ".0f"),
+                        bkg_er=format(perr[3], ".0f"),
+                        contrast=format(contrast, ".1f"),
+                        contrast_error=format(contrast_error, ".1f"),
+                    ),
+                )
             plt.legend(loc="best")
             if title_on is True:
                 plt.title(
@@ -121,11 +121,7 @@ def collect_data_and_apply_mask(
                 include_offset=False,
                 apply_calibration=False,
             )
-        for i in range(256):
-            tdc, pix = np.argwhere(pix_coor == i)[0]
-            ind = np.where(data[tdc].T[0] == pix)[0]
-            ind1 = np.where(data[tdc].T[1][ind] > 0)[0]
-            timestamps_per_pixel[i] += len(data[tdc].T[1][ind[ind1]])
+        timestamps_per_pixel += utils.count_valid_timestamps(data, pix_coor)
 
     if correct_pix_address:
         fix = np.zeros(len(timestamps_per_pixel))
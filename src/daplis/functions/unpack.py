@@ -17,6 +17,7 @@ import os
 
 import numpy as np
 
+from daplis.functions import utils
 from daplis.functions.calibrate import load_calibration_data
 
 
@@ -78,10 +79,13 @@ def unpack_binary_data(
     if not isinstance(firmware_version, str):
         raise TypeError("'firmware_version' should be a string.")
 
-    # Unpack binary data
-    raw_data = np.fromfile(file, dtype=np.uint32)
-    # Timestamps are stored in the lower 28 bits
-    data_timestamps = (raw_data & 0xFFFFFFF).astype(np.int64)
+    # Unpack binary data; the file is memory-mapped and read by the
+    # operations below directly, without copying it into a buffer first
+    raw_data = np.memmap(file, dtype=np.uint32, mode="r")
+    # Timestamps are stored in the lower 28 bits; raw codes fit into
+    # int32, which halves the memory moved while reshaping, and are
+    # widened to int64 only before the calibration
+    data_timestamps = (raw_data & 0xFFFFFFF).astype(np.int32)
     # Pixel address in the given TDC is 2 bits above timestamp
     data_pixels = ((raw_data >> 28) & 0x3).astype(np.int8)
     # Check the top bit, assign '-1' to invalid timestamps
@@ -169,10 +173,14 @@ def unpack_binary_data(
                 "Check the path or run the calibration."
             )
 
+        # Transform pixel number to TDC number and pixel coordinates in
+        # that TDC (from 0 to 3)
+        tdc_of_pixel, col_of_pixel = utils.invert_pixel_coordinates(
+            pix_coordinates
+        )
+
         for i in range(256):
-            # Transform pixel number to TDC number and pixel coordinates in
-            # that TDC (from 0 to 3)
-            tdc, pix = np.argwhere(pix_coordinates == i)[0]
+            tdc, pix = tdc_of_pixel[i], col_of_pixel[i]
             # Find data from that pixel
             ind = np.where(data_all[tdc].T[0] == pix)[0]
             # Cut non-valid timestamps ('-1's)
@@ -245,6 +253,9 @@ def unpack_binary_data_with_absolute_timestamps(
         'firmware_version' parameters are not of string type.
     FileNotFoundError
         If no calibration data file is found.
+    ValueError
+        If the data file does not hold a whole number of cycles with
+        absolute timestamps.
 
     Notes
     -----
@@ -265,48 +276,42 @@ def unpack_binary_data_with_absolute_timestamps(
     if not isinstance(firmware_version, str):
         raise TypeError("'firmware_version' should be a string.")
 
-    # Unpack binary data
-    raw_data = np.fromfile(file_path, dtype=np.uint32)
-    # Timestamps are stored in the lower 28 bits
-    data_timestamps_all = (raw_data & 0xFFFFFFF).astype(np.int64)
-    # Number of acquisition cycles in each data file
-    cycles = len(data_timestamps_all) // (timestamps * 65 + 2)
-
-    # List of indices of absolute timestamps
-    ind = []
-    # Converted absolute timestamps: from binary to ps
-    absolute_timestamps = np.zeros(cycles)
-
-    # Collect the absolute timestamps indices; absolute timestamps
-    # inserted at the start of each cycle
-    for cyc in range(cycles):
-        ind.extend(
-            [
-                x
-                for x in range(
-                    cyc * (65 * timestamps + 2),
-                    cyc * (65 * timestamps + 2) + 2,
-                )
-            ]
+    # Unpack binary data; the file is memory-mapped and read by the
+    # operations below directly, without copying it into a buffer first
+    raw_data = np.memmap(file_path, dtype=np.uint32, mode="r")
+    # Number of acquisition cycles in each data file; each cycle starts
+    # with two words holding the absolute timestamp
+    cycle_length = timestamps * 65 + 2
+    if len(raw_data) % cycle_length != 0:
+        raise ValueError(
+            "The data file does not hold a whole number of cycles with "
+            "absolute timestamps. Check the number of timestamps and "
+            "that the data were recorded with absolute timestamps."
         )
+    cycles = len(raw_data) // cycle_length
+    raw_data = raw_data[: cycles * cycle_length].reshape(cycles, -1)
 
-    # Absolute timestamps only
-    data_absolute_timestamps = data_timestamps_all[ind].reshape(cycles, 2)
+    # Lower and higher parts of the absolute timestamps, both stored in
+    # the lower 28 bits
+    absolute_low = (raw_data[:, 0] & 0xFFFFFFF).astype(np.int64)
+    absolute_high = (raw_data[:, 1] & 0xFFFFFFF).astype(np.int64)
 
-    # Convert the absolute timestamps from binary to decimal (ps)
-    for cyc in range(cycles):
-        absolute_timestamps[cyc] = int(
-            "0b"
-            + bin(int(data_absolute_timestamps[cyc][1]))[2:]
-            + bin(int(data_absolute_timestamps[cyc][0]))[2:],
-            2,
-        )
+    # Convert the absolute timestamps from binary to decimal (ps): the
+    # binary digits of the higher part are followed by those of the
+    # lower part, where zero still takes a single digit
+    _, low_bit_length = np.frexp(absolute_low)
+    low_bit_length = np.maximum(low_bit_length, 1)
+    absolute_timestamps = (
+        (absolute_high << low_bit_length) | absolute_low
+    ).astype(np.float64)
 
-    del data_absolute_timestamps
+    del absolute_low, absolute_high
 
     # Cut the absolute timestamps, collect the timestamps
-    raw_data_cut = np.delete(raw_data, ind)
-    data_timestamps_cut = (raw_data_cut & 0xFFFFFFF).astype(np.int64)
+    raw_data_cut = raw_data[:, 2:].ravel()
+    # Raw codes fit into int32, which halves the memory moved while
+    # reshaping; they are widened to int64 only before the calibration
+    data_timestamps_cut = (raw_data_cut & 0xFFFFFFF).astype(np.int32)
     data_timestamps_cut[raw_data_cut < 0x80000000] = -1
     # Pixel address in the given TDC is 2 bits above timestamp
     data_pixels = ((raw_data_cut >> 28) & 0x3).astype(np.int8)
@@ -387,10 +392,14 @@ def unpack_binary_data_with_absolute_timestamps(
                 "Check the path or run the calibration."
             )
 
+        # Transform pixel number to TDC number and pixel coordinates in
+        # that TDC (from 0 to 3)
+        tdc_of_pixel, col_of_pixel = utils.invert_pixel_coordinates(
+            pixel_coordinates
+        )
+
         for i in range(256):
-            # Transform pixel number to TDC number and pixel coordinates in
-            # that TDC (from 0 to 3)
-            tdc, pix = np.argwhere(pixel_coordinates == i)[0]
+            tdc, pix = tdc_of_pixel[i], col_of_pixel[i]
             # Find data from that pixel
             ind = np.where(data_all[tdc].T[0] == pix)[0]
             # Cut non-valid timestamps ('-1's)
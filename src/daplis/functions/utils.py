@@ -16,11 +16,23 @@ functions:
 
     * gaussian - Gaussian function for curve fitting.
 
+    * gaussian_jacobian - Jacobian of the Gaussian function with respect
+    to its parameters.
+
     * fit_gaussian - Fit Gaussian function to data and return optimal
     parameters and covariance.
 
     * pixel_list_transform - Transform a list of pixels into two separate
     lists based on input type.
+
+    * invert_pixel_coordinates - Build lookup tables for the TDC number
+    and the pixel position in that TDC for each pixel.
+
+    * count_valid_timestamps - Count the valid (positive) timestamps in
+    each pixel of the unpacked data.
+
+    * deltas_to_table - Convert a dictionary of timestamp differences
+    into a pyarrow table, padding shorter columns with nulls.
     
     * correct_pixels_address - correct the pixel addressing, the output
     has the same dimensions as the input. Should be used for motherboard
@@ -51,6 +63,7 @@ from typing import List
 import matplotlib
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from pyarrow import feather as ft
 from scipy.optimize import curve_fit
 
@@ -161,6 +174,48 @@ def gaussian(x, amp, mu, sigma, bkg):
     return amp * np.exp(-((x - mu) ** 2) / (2 * sigma**2)) + bkg
 
 
+def gaussian_jacobian(x, amp, mu, sigma, bkg):
+    """Jacobian of the Gaussian function.
+
+    Partial derivatives of `gaussian` with respect to its parameters,
+    used in curve fitting instead of finite differences.
+
+    Parameters
+    ----------
+    x : array-like
+        The input data.
+    amp : float
+        Amplitude of the Gaussian.
+    mu : float
+        Mean (center) of the Gaussian.
+    sigma : float
+        Standard deviation of the Gaussian.
+    bkg : float
+        Background offset.
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of the derivatives, where rows correspond to the input
+        data and columns to the parameters 'amp', 'mu', 'sigma' and
+        'bkg'.
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    shifted = x - mu
+    exponent = np.exp(-(shifted**2) / (2 * sigma**2))
+
+    return np.stack(
+        (
+            exponent,
+            amp * exponent * shifted / sigma**2,
+            amp * exponent * shifted**2 / sigma**3,
+            np.ones_like(x),
+        ),
+        axis=1,
+    )
+
+
 def fit_gaussian(x, y):
     """Fit Gaussian function to data.
 
@@ -183,16 +238,53 @@ def fit_gaussian(x, y):
             the variance of the parameter estimates.
 
     """
-    # Initial guess for the parameters
-    amp_guess = np.max(y)
-    mu_guess = x[np.argmax(y)]
-    # As std sometimes gives nonsense, 150 ps is added as balancing
-    sigma_guess = min(np.std(x), 150)
+    # Histogram data are always finite, so the data are converted to
+    # contiguous float64 arrays once here and curve_fit is told to skip
+    # its own conversion and finiteness checks
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+
+    # Initial guess for the parameters: position and width of the peak
+    # are taken from the region above its half maximum in a lightly
+    # smoothed histogram, so that a single noisy bin is not taken for
+    # the peak
     bkg_guess = np.median(y)
+    window = min(5, len(y))
+    peak = np.convolve(y, np.ones(window) / window, mode="same") - bkg_guess
+    peak_pos = np.argmax(peak)
+
+    if peak[peak_pos] > 0:
+        below_half = np.flatnonzero(peak <= peak[peak_pos] / 2)
+        left = below_half[below_half < peak_pos]
+        right = below_half[below_half > peak_pos]
+        start = left[-1] + 1 if len(left) else 0
+        stop = right[0] if len(right) else len(y)
+
+        amp_guess = np.max(y[start:stop]) - bkg_guess
+        # Center of mass of the background-subtracted peak
+        weights = np.clip(y[start:stop] - bkg_guess, 0, None)
+        if np.sum(weights) > 0:
+            mu_guess = np.sum(x[start:stop] * weights) / np.sum(weights)
+        else:
+            mu_guess = x[peak_pos]
+        # Full width at half maximum, including the bin width
+        bin_width = x[1] - x[0] if len(x) > 1 else 0
+        sigma_guess = (x[stop - 1] - x[start] + bin_width) / 2.3548
+    else:
+        # No peak above the background, fall back to a generic guess
+        amp_guess = np.max(y)
+        mu_guess = x[np.argmax(y)]
+        # As std sometimes gives nonsense, 150 ps is added as balancing
+        sigma_guess = min(np.std(x), 150)
 
     # Perform the curve fitting
     popt, pcov = curve_fit(
-        gaussian, x, y, p0=[amp_guess, mu_guess, sigma_guess, bkg_guess]
+        gaussian,
+        x,
+        y,
+        p0=[amp_guess, mu_guess, sigma_guess, bkg_guess],
+        jac=gaussian_jacobian,
+        check_finite=False,
     )
 
     return popt, pcov
@@ -227,6 +319,127 @@ def pixel_list_transform(pixels: list):
     return [pixels_left, pixels_right]
 
 
+def invert_pixel_coordinates(pix_coor: np.ndarray):
+    """Build lookup tables from pixel number to TDC coordinates.
+
+    Inverts the matrix of pixel coordinates so that the TDC number and
+    the position of the pixel in that TDC can be looked up directly
+    instead of searching the whole matrix for each pixel.
+
+    Parameters
+    ----------
+    pix_coor : np.ndarray
+        Matrix of pixel coordinates, where rows are numbers of TDCs
+        and columns are the pixels that are connected to these TDCs.
+
+    Returns
+    -------
+    np.ndarray, np.ndarray
+        TDC number and position of the pixel in that TDC, indexed by
+        the pixel number.
+    """
+    pixel_order = np.argsort(pix_coor, axis=None)
+
+    return np.divmod(pixel_order, pix_coor.shape[1])
+
+
+def count_valid_timestamps(data: np.ndarray, pix_coor: np.ndarray):
+    """Count valid timestamps in each pixel.
+
+    Counts positive timestamps for each pixel in the unpacked data,
+    using a single pass over each TDC instead of masking the data
+    separately for each pixel. Counts of all TDCs are then put in the
+    order of pixels with a single scatter.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Unpacked data, where rows are TDCs and each cell holds the pixel
+        coordinate in the TDC and the timestamp.
+    pix_coor : np.ndarray
+        Matrix of pixel coordinates, where rows are numbers of TDCs
+        and columns are the pixels that are connected to these TDCs.
+
+    Returns
+    -------
+    np.ndarray
+        Number of valid timestamps for each of the 256 pixels.
+    """
+    # Counts for each TDC, where columns are the pixels in that TDC
+    valid_per_tdc = np.zeros(pix_coor.shape, dtype=np.int64)
+    for tdc in range(len(pix_coor)):
+        valid = data[tdc].T[1] > 0
+        valid_per_tdc[tdc] = np.bincount(
+            data[tdc].T[0][valid], minlength=pix_coor.shape[1]
+        )
+
+    valid_per_pixel = np.zeros(pix_coor.size, dtype=np.int64)
+    valid_per_pixel[pix_coor] = valid_per_tdc
+
+    return valid_per_pixel
+
+
+def deltas_to_table(deltas_all: dict) -> pa.Table:
+    """Convert timestamp differences into a pyarrow table.
+
+    Each pair of pixels becomes an int32 column; columns shorter than
+    the longest one are padded with nulls. Replaces building a pandas
+    dataframe row-wise via 'from_dict' and transposing it before
+    saving the '.feather' file. The differences are whole picoseconds,
+    as the unpacked timestamps are stored as integers, so int32 keeps
+    them exact for windows of up to about 2 ms and halves the size of
+    the '.feather' files. Columns with nulls are read back by pandas
+    as float64 with NaN.
+
+    Parameters
+    ----------
+    deltas_all : dict
+        Dictionary of timestamp differences, where keys are the pairs
+        of pixels in the "pixel1,pixel2" format.
+
+    Returns
+    -------
+    pa.Table
+        Table with a column of timestamp differences for each pair of
+        pixels.
+
+    Raises
+    ------
+    ValueError
+        If the timestamp differences are not whole numbers or do not
+        fit into int32.
+    """
+    longest = max((len(deltas) for deltas in deltas_all.values()), default=0)
+    int32_limits = np.iinfo(np.int32)
+
+    columns = {}
+    for pair, deltas in deltas_all.items():
+        deltas = np.asarray(deltas)
+        # Check the differences before the cast, which would silently
+        # wrap large values and truncate fractional ones
+        if len(deltas) and (
+            np.min(deltas) < int32_limits.min
+            or np.max(deltas) > int32_limits.max
+        ):
+            raise ValueError(
+                f"Timestamp differences for pixels {pair} do not fit "
+                "into int32. Use a narrower 'delta_window'."
+            )
+        deltas_int = deltas.astype(np.int32)
+        if not np.array_equal(deltas_int, deltas):
+            raise ValueError(
+                f"Timestamp differences for pixels {pair} are not whole "
+                "picoseconds."
+            )
+        deltas = deltas_int
+        padding = np.arange(longest) >= len(deltas)
+        columns[pair] = pa.array(
+            np.pad(deltas, (0, longest - len(deltas))), mask=padding
+        )
+
+    return pa.table(columns)
+
+
 def __correct_pix_address(pix: int):
     """Pixel address correction.
 
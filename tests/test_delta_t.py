@@ -1,10 +1,13 @@
 import os
 import shutil
+import tempfile
 import unittest
 
 import numpy as np
+import pyarrow.feather as ft
 
 from daplis.functions.delta_t import (
+    _bincount_histogram,
     calculate_and_save_timestamp_differences,
     calculate_and_save_timestamp_differences_fast,
     collect_and_plot_timestamp_differences,
@@ -14,101 +17,102 @@ from daplis.functions.fits import (
     fit_with_gaussian_all,
     fit_with_gaussian_fancy,
 )
+from daplis.functions.utils import apply_mask
 
 
 class TestDeltasFull(unittest.TestCase):
-    def setUp(self):
-        # Set up test variables
-        self.partial_path = "tests/test_data"
-        self.pixels = [
+    @classmethod
+    def setUpClass(cls):
+        # Set up test variables; the path to the test data is resolved
+        # once for all tests
+        cls.path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)), "test_data"
+        )
+        cls.pixels = [
             [x for x in range(66, 70)],
             [x for x in range(170, 178)],
         ]
-        self.daughterboard_number = "NL11"
-        self.motherboard_number = "#33"
-        self.firmware_version = "2212b"
-        self.timestamps = 300
-        self.delta_window = 20e3
-        self.rewrite = True
-        self.range_left = -20e3
-        self.range_right = 20e3
-        self.same_y = False
-        self.app_mask = True
-        self.include_offset = False
-
-    def test_a_deltas_save_positive(self):
-        # Test positive case for deltas_save function
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        # os.chdir(work_dir)
-
-        path = os.path.join(work_dir, self.partial_path)
-        calculate_and_save_timestamp_differences(
-            path,
-            self.pixels,
-            self.rewrite,
-            self.daughterboard_number,
-            self.motherboard_number,
-            self.firmware_version,
-            self.timestamps,
-            self.delta_window,
-            self.app_mask,
-            self.include_offset,
+        cls.daughterboard_number = "NL11"
+        cls.motherboard_number = "#33"
+        cls.firmware_version = "2212b"
+        cls.timestamps = 300
+        cls.delta_window = 20e3
+        cls.rewrite = True
+        cls.range_left = -20e3
+        cls.range_right = 20e3
+        cls.same_y = False
+        cls.app_mask = True
+        cls.include_offset = False
+
+        # Timestamp differences are calculated once and the '.feather'
+        # file is reused by all tests that plot or fit them
+        calculate_and_save_timestamp_differences_fast(
+            cls.path,
+            cls.pixels,
+            cls.rewrite,
+            cls.daughterboard_number,
+            cls.motherboard_number,
+            cls.firmware_version,
+            cls.timestamps,
+            cls.delta_window,
+            app_mask=cls.app_mask,
+            include_offset=cls.include_offset,
         )
-
-        os.chdir(
-            os.path.join(
-                os.path.dirname(os.path.realpath(__file__)), "test_data"
-            )
+        cls.feather_file = os.path.join(
+            cls.path, "delta_ts_data/test_data_2212b-test_data_2212b.feather"
         )
 
-        # Check if the csv file is created
-        self.assertTrue(
-            os.path.isfile(
-                "delta_ts_data/test_data_2212b-test_data_2212b.feather"
+    def test_a_deltas_save_positive(self):
+        # Test positive case for deltas_save function; it is run in a
+        # separate folder so the output of the fast function is kept
+        with tempfile.TemporaryDirectory() as path:
+            shutil.copy(os.path.join(self.path, "test_data_2212b.dat"), path)
+            calculate_and_save_timestamp_differences(
+                path,
+                self.pixels,
+                self.rewrite,
+                self.daughterboard_number,
+                self.motherboard_number,
+                self.firmware_version,
+                self.timestamps,
+                self.delta_window,
+                self.app_mask,
+                self.include_offset,
             )
-        )
-
-    def test_a_deltas_save_fast_positive(self):
-        # Test positive case for deltas_save function
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        # os.chdir(work_dir)
 
-        path = os.path.join(work_dir, self.partial_path)
-        calculate_and_save_timestamp_differences_fast(
-            path,
-            self.pixels,
-            self.rewrite,
-            self.daughterboard_number,
-            self.motherboard_number,
-            self.firmware_version,
-            self.timestamps,
-            self.delta_window,
-            app_mask=self.app_mask,
-            include_offset=self.include_offset,
-        )
-
-        os.chdir(
-            os.path.join(
-                os.path.dirname(os.path.realpath(__file__)), "test_data"
+            feather_file = os.path.join(
+                path, "delta_ts_data/test_data_2212b-test_data_2212b.feather"
             )
-        )
-
-        # Check if the csv file is created
-        self.assertTrue(
-            os.path.isfile(
-                "delta_ts_data/test_data_2212b-test_data_2212b.feather"
+            data = ft.read_table(feather_file)
+
+        # Check that both functions give the same differences for each
+        # pair of pixels
+        data_fast = ft.read_table(self.feather_file)
+        self.assertEqual(data.column_names, data_fast.column_names)
+        for column in data.column_names:
+            np.testing.assert_array_equal(
+                np.sort(data[column].drop_null().to_numpy()),
+                np.sort(data_fast[column].drop_null().to_numpy()),
             )
-        )
+
+    def test_a_deltas_save_fast_positive(self):
+        # Test positive case for deltas_save_fast function; the function
+        # itself is run once in setUpClass. Check that the feather file
+        # holds a column for each pair of pixels that are not masked
+        data = ft.read_table(self.feather_file)
+        mask = apply_mask(self.daughterboard_number, self.motherboard_number)
+        pairs = [
+            f"{q},{w}"
+            for q in self.pixels[0]
+            for w in self.pixels[1]
+            if q not in mask and w not in mask
+        ]
+        self.assertEqual(sorted(data.column_names), sorted(pairs))
 
     # Negative test case
     # Invalid firmware version
     def test_b_deltas_save_negative(self):
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        # os.chdir(work_dir)
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         # Test negative case for deltas_save function
         with self.assertRaises(TypeError):
@@ -126,10 +130,7 @@ class TestDeltasFull(unittest.TestCase):
     def test_c_delta_cp(self):
         # Test case for delta_cp function
         # Positive test case
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        # os.chdir(work_dir)
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         collect_and_plot_timestamp_differences(
             path,
@@ -152,9 +153,7 @@ class TestDeltasFull(unittest.TestCase):
 
     def test_d_fit_with_gaussian_positive(self):
         # Test with valid input
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
         pixels = [67, 174]
         window = 20e3
         multiplier = 5
@@ -183,9 +182,7 @@ class TestDeltasFull(unittest.TestCase):
         # Test with valid input
         pixels = [82, 116]
 
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         ft_file = r"test.feather"
 
@@ -201,7 +198,10 @@ class TestDeltasFull(unittest.TestCase):
         # Assert that the function runs without raising any exceptions
         self.assertTrue(
             os.path.isfile(
-                f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_all_fit.png"
+                os.path.join(
+                    path,
+                    f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_all_fit.png",
+                )
             )
         )
 
@@ -209,9 +209,7 @@ class TestDeltasFull(unittest.TestCase):
         # Test with valid input
         pixels = [82, 116]
 
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         ft_file = r"test.feather"
 
@@ -228,15 +226,16 @@ class TestDeltasFull(unittest.TestCase):
         # Assert that the function runs without raising any exceptions
         self.assertTrue(
             os.path.isfile(
-                f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_fancy_fit.png"
+                os.path.join(
+                    path,
+                    f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_fancy_fit.png",
+                )
             )
         )
 
     def test_d_fit_with_gaussian_pickle_positive(self):
         # Test with valid input
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
         pixels = [67, 174]
         window = 20e3
         multiplier = 5
@@ -254,8 +253,11 @@ class TestDeltasFull(unittest.TestCase):
         # Assert that the function runs without raising any exceptions
         self.assertTrue(
             os.path.isfile(
-                "results/fits/test_data_2212b-test_data_2212b_"
-                f"pixels_{pixels[0]},{pixels[1]}_fit.pkl"
+                os.path.join(
+                    path,
+                    "results/fits/test_data_2212b-test_data_2212b_"
+                    f"pixels_{pixels[0]},{pixels[1]}_fit.pkl",
+                )
             )
         )
 
@@ -263,9 +265,7 @@ class TestDeltasFull(unittest.TestCase):
         # Test with valid input
         pixels = [82, 116]
 
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         ft_file = r"test.feather"
 
@@ -282,7 +282,10 @@ class TestDeltasFull(unittest.TestCase):
         # Assert that the function runs without raising any exceptions
         self.assertTrue(
             os.path.isfile(
-                f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_all_fit.pkl"
+                os.path.join(
+                    path,
+                    f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_all_fit.pkl",
+                )
             )
         )
 
@@ -290,9 +293,7 @@ class TestDeltasFull(unittest.TestCase):
         # Test with valid input
         pixels = [82, 116]
 
-        work_dir = os.path.dirname(os.path.realpath(__file__)) + "/.."
-
-        path = os.path.join(work_dir, self.partial_path)
+        path = self.path
 
         ft_file = r"test.feather"
 
@@ -310,15 +311,40 @@ class TestDeltasFull(unittest.TestCase):
         # Assert that the function runs without raising any exceptions
         self.assertTrue(
             os.path.isfile(
-                f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_fancy_fit.pkl"
+                os.path.join(
+                    path,
+                    f"results/fits/test_pixels_{pixels[0]},{pixels[1]}_fancy_fit.pkl",
+                )
             )
         )
 
-    def tearDownClass():
+    @classmethod
+    def tearDownClass(cls):
         # Clean up after tests
-        os.chdir(r"{}".format(os.path.dirname(os.path.realpath(__file__))))
-        shutil.rmtree("test_data/delta_ts_data")
-        shutil.rmtree("test_data/results")
+        shutil.rmtree(os.path.join(cls.path, "delta_ts_data"))
+        shutil.rmtree(os.path.join(cls.path, "results"))
+
+
+class TestBincountHistogram(unittest.TestCase):
+    def test_bincount_histogram(self):
+        # Counts should match np.histogram for bins built as in the
+        # plots, including values on and right next to the bin edges,
+        # where the bin index from the bin width is off by one
+        rng = np.random.default_rng(0)
+        bins = np.arange(-7988, 17739, 2500 / 140 * 5)
+        data = np.concatenate(
+            (
+                rng.normal(5e3, 5e3, 5000),
+                bins,
+                np.nextafter(bins, -np.inf),
+                np.nextafter(bins, np.inf),
+            )
+        )
+        for dtype in (np.float32, np.float64, np.int32):
+            np.testing.assert_array_equal(
+                _bincount_histogram(data.astype(dtype), bins),
+                np.histogram(data.astype(dtype), bins)[0],
+            )
 
 
 if __name__ == "__main__":
@@ -1,8 +1,12 @@
 import os
+import tempfile
 import unittest
 
 import numpy as np
-from daplis.functions.unpack import unpack_binary_data
+from daplis.functions.unpack import (
+    unpack_binary_data,
+    unpack_binary_data_with_absolute_timestamps,
+)
 
 
 class TestUnpackBin(unittest.TestCase):
@@ -31,6 +35,51 @@ class TestUnpackBin(unittest.TestCase):
         # Assert the data type of the output data
         self.assertEqual(data_all.dtype, np.longlong)
 
+    def test_absolute_timestamps_negative(self):
+        # Negative test case: data without absolute timestamps do not
+        # split into whole cycles with them
+        file = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            "test_data",
+            "test_data_2212b.dat",
+        )
+
+        with self.assertRaises(ValueError):
+            unpack_binary_data_with_absolute_timestamps(
+                file, "NL11", "#33", "2212b", 300
+            )
+
+    def test_absolute_timestamps_decode(self):
+        # Absolute timestamps are the binary digits of the higher word
+        # followed by those of the lower word; zero takes a single digit
+        timestamps = 2
+        low = np.array([0, 1, 5, 0, 0xFFFFFFF, 12345], dtype=np.uint32)
+        high = np.array([0, 0, 3, 7, 0xFFFFFFF, 0], dtype=np.uint32)
+        cycles = np.zeros((len(low), 65 * timestamps + 2), dtype=np.uint32)
+        # Bits above the lower 28 are not part of the timestamp
+        cycles[:, 0] = low | 0xF0000000
+        cycles[:, 1] = high
+
+        expected = [
+            int("0b" + bin(int(higher))[2:] + bin(int(lower))[2:], 2)
+            for lower, higher in zip(low, high)
+        ]
+
+        with tempfile.TemporaryDirectory() as path:
+            file = os.path.join(path, "absolute.dat")
+            cycles.tofile(file)
+            output = unpack_binary_data_with_absolute_timestamps(
+                file,
+                "NL11",
+                "#33",
+                "2212b",
+                timestamps,
+                apply_calibration=False,
+            )
+
+        # Second output holds the absolute timestamps
+        np.testing.assert_array_equal(output[1], expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import os
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from daplis.functions.unpack import unpack_binary_data
+from daplis.functions.utils import (
+    count_valid_timestamps,
+    deltas_to_table,
+    invert_pixel_coordinates,
+)
+
+
+class TestUtils(unittest.TestCase):
+    def test_invert_pixel_coordinates(self):
+        # Lookup tables should give the same TDC coordinates as
+        # searching the matrix of pixel coordinates for each pixel
+        for pix_coor in (
+            np.arange(256).reshape(64, 4),
+            np.arange(256).reshape(4, 64).T,
+        ):
+            tdc_of_pixel, col_of_pixel = invert_pixel_coordinates(pix_coor)
+            for i in range(256):
+                tdc, pix = np.argwhere(pix_coor == i)[0]
+                self.assertEqual(
+                    (tdc_of_pixel[i], col_of_pixel[i]), (tdc, pix)
+                )
+
+    def test_count_valid_timestamps(self):
+        # Counts should match masking the data for each pixel
+        file = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            "test_data",
+            "test_data_2212b.dat",
+        )
+        data = unpack_binary_data(
+            file, "NL11", "#33", "2212b", 300, apply_calibration=False
+        )
+        pix_coor = np.arange(256).reshape(64, 4)
+
+        expected = np.zeros(256)
+        for i in range(256):
+            tdc, pix = np.argwhere(pix_coor == i)[0]
+            ind = np.where(data[tdc].T[0] == pix)[0]
+            ind1 = np.where(data[tdc].T[1][ind] > 0)[0]
+            expected[i] = len(data[tdc].T[1][ind[ind1]])
+
+        np.testing.assert_array_equal(
+            count_valid_timestamps(data, pix_coor), expected
+        )
+
+    def test_deltas_to_table(self):
+        # Table should hold the same values as a dataframe built from
+        # the dictionary, with the shorter columns padded
+        deltas_all = {
+            "0,1": [-150, 20, 17858],
+            "0,2": [],
+            "1,2": [5, -5, 0, 12000, -19999],
+        }
+        expected = pd.DataFrame.from_dict(deltas_all, orient="index").T
+
+        table = deltas_to_table(deltas_all)
+
+        self.assertEqual(table.column_names, list(deltas_all))
+        pd.testing.assert_frame_equal(
+            table.to_pandas(), expected, check_dtype=False
+        )
+
+    def test_deltas_to_table_negative(self):
+        # Differences that do not fit into int32 or are not whole
+        # picoseconds should not be cast silently
+        for deltas in ([5, 2**31], [-(2**31) - 1], [-150, 17.5]):
+            with self.assertRaises(ValueError):
+                deltas_to_table({"0,1": deltas})
+
+
+if __name__ == "__main__":
+    unittest.main()